@@ -6,19 +6,155 @@ Provides a GUI for configuring camera devices and URLs before starting the appli
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import cv2
 import numpy as np
 from PIL import Image, ImageTk
 import threading
 import time
 import json
 import os
+import re
+import sys
+from dataclasses import dataclass, asdict, fields
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from typing import Optional, Dict, List
 import logging
-from config import *
+from config import DEVICE_PROBE_TIMEOUT, FRAME_WIDTH, FRAME_HEIGHT, PREVIEW_FPS, URL_TEST_TIMEOUT
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# OpenCV is imported on first use (see _lazy_cv2)
+_cv2 = None
+
+
+def _lazy_cv2():
+    """Import OpenCV on first use so importing this module stays cheap."""
+    global _cv2
+    if _cv2 is None:
+        import cv2
+        _cv2 = cv2
+    return _cv2
+
+
+def _capture_backend() -> int:
+    """Return the native capture backend, avoiding OpenCV's slow fallback chain."""
+    cv2 = _lazy_cv2()
+    if sys.platform.startswith('win'):
+        return cv2.CAP_DSHOW
+    if sys.platform.startswith('linux'):
+        return cv2.CAP_V4L2
+    return cv2.CAP_ANY
+
+
+def _enumerate_device_indices() -> List[int]:
+    """Return the camera indices worth probing, using OS enumeration where possible."""
+    if sys.platform.startswith('linux'):
+        try:
+            return sorted(int(entry.name[5:]) for entry in os.scandir('/dev')
+                          if entry.name.startswith('video') and entry.name[5:].isdigit())
+        except OSError:
+            pass
+    elif sys.platform.startswith('win'):
+        try:
+            from pygrabber.dshow_graph import FilterGraph
+            return list(range(len(FilterGraph().get_input_devices())))
+        except Exception:
+            pass
+    return list(range(10))  # Fall back to checking the first 10 devices
+
+
+def _preview_image(rgb: np.ndarray) -> Image.Image:
+    """Wrap the current contents of an RGB preview buffer in a PIL image.
+    
+    Pillow only maps external memory for a few modes and silently copies an
+    'RGB' buffer, so the image has to be rebuilt from the buffer every frame.
+    """
+    return Image.fromarray(rgb, 'RGB')
+
+
+class _StreamCapture:
+    """VideoCapture-like view of a CameraStream so URL cameras share the preview pump."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._seen = 0  # Stream frame count at the last successful grab
+    
+    def isOpened(self) -> bool:
+        return not self.stream.stopped
+    
+    def grab(self) -> bool:
+        # Only report a frame the pump hasn't shown yet, so a stalled stream isn't re-converted
+        produced = self.stream._produced
+        if produced == self._seen or self.stream.frame is None:
+            return False
+        self._seen = produced
+        return True
+    
+    def retrieve(self, image: Optional[np.ndarray] = None):
+        # Always copy out of the stream; its buffers are refilled by the capture thread
+        frame = self.stream.frame
+        if frame is None:
+            return False, None
+        if image is None or image.shape != frame.shape:
+            image = np.empty_like(frame)
+        return True, self.stream.get_frame(out=image)
+    
+    def release(self):
+        self.stream.stop()
+
+
+# slots=True is only available on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class CameraCfg:
+    """Configuration for a single camera."""
+    type: str = 'device'  # 'device' or 'url'
+    device_index: int = 0
+    url: str = ''
+    name: str = ''
+    enabled: bool = True
+
+
+_CFG_FIELDS = frozenset(f.name for f in fields(CameraCfg))
+
+
+def _config_from_json(data: Dict) -> Dict[str, CameraCfg]:
+    """Build per-camera configs from a parsed camera_config.json."""
+    # Ignore keys CameraCfg doesn't define (hand edits, other versions) rather than rejecting the file
+    return {camera_id: CameraCfg(**{k: v for k, v in cfg.items() if k in _CFG_FIELDS})
+            for camera_id, cfg in data.items()}
+
+
+def _dumps_config(camera_config: Dict[str, CameraCfg]) -> bytes:
+    """Serialize a camera configuration as indented, key-sorted JSON bytes."""
+    config = {camera_id: asdict(cfg) for camera_id, cfg in camera_config.items()}
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(config, indent=2, sort_keys=True).encode('utf-8')
+
+
+def _atomic_write(path: str, data: bytes):
+    """Write data via a temporary file so a crash never leaves path half-written."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# Preview thumbnail size (width, height)
+PREVIEW_SIZE = (320, 240)
+
+# Matches the CAMERA_1_INDEX / CAMERA_2_INDEX assignments in config.py
+_CAMERA_INDEX_RE = re.compile(r'(CAMERA_([12])_INDEX)\s*=\s*\d+')
+
 
 class CameraConfigUI:
     """Camera configuration interface."""
@@ -30,26 +166,24 @@ class CameraConfigUI:
         
         # Camera configuration
         self.camera_config = {
-            'camera1': {
-                'type': 'device',  # 'device' or 'url'
-                'device_index': 0,
-                'url': '',
-                'name': 'Camera 1',
-                'enabled': True
-            },
-            'camera2': {
-                'type': 'device',
-                'device_index': 1,
-                'url': '',
-                'name': 'Camera 2',
-                'enabled': True
-            }
+            'camera1': CameraCfg(device_index=0, name='Camera 1'),
+            'camera2': CameraCfg(device_index=1, name='Camera 2')
         }
         
         # Test camera instances
         self.test_cameras = {}
         self.test_frames = {}
-        self.preview_threads = {}  # Track preview threads
+        self._preview_pump_thread = None  # Shared preview thread for all test cameras
+        self._pump_stop = threading.Event()
+        self._url_open_executor = ThreadPoolExecutor(max_workers=2)  # Opens URL cameras off the Tk thread
+        self._test_generation = 0  # Bumped whenever test cameras are stopped
+        self._preview_bufs = {}  # Reusable per-camera preview frame buffers
+        self._preview_ready = {}  # Set once the last posted preview has been shown
+        self._latest_frames = {}  # Newest RGB preview per camera, drained by _update_previews
+        self._latest_frames_lock = threading.Lock()
+        self._previews_active = False  # Whether the _update_previews tick is scheduled
+        self._preview_tick_id = None
+        self._device_cache = None  # Cached result of the last device scan
         
         # GUI elements
         self.camera_frames = {}
@@ -59,6 +193,10 @@ class CameraConfigUI:
         self.enable_vars = {}
         self.name_vars = {}
         self.type_vars = {}  # Store type selection variables
+        self.device_combos = {}  # Device comboboxes, updated on refresh
+        self._device_frames = {}  # Device selection frame per camera
+        self._url_frames = {}  # URL input frame per camera
+        self._available_devices = []
         
     def start(self):
         """Start the camera configuration interface."""
@@ -72,11 +210,13 @@ class CameraConfigUI:
             # Load existing configuration
             self._load_config()
             
+            # Scan devices once up front; all camera panels share the result
+            self._available_devices = self._get_available_devices()
+            
             self._create_widgets()
             self._create_menu()
             
             self.running = True
-            self._update_previews()
             
             logger.info("Camera configuration interface started")
             self.root.mainloop()
@@ -133,34 +273,34 @@ class CameraConfigUI:
         camera1_frame = ttk.LabelFrame(parent, text="Camera 1", padding="10")
         camera1_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
         
-        self._create_single_camera_widgets(camera1_frame, 'camera1')
+        self._create_single_camera_widgets(camera1_frame, 'camera1', self._available_devices)
         
         # Camera 2 configuration
         camera2_frame = ttk.LabelFrame(parent, text="Camera 2", padding="10")
         camera2_frame.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        self._create_single_camera_widgets(camera2_frame, 'camera2')
+        self._create_single_camera_widgets(camera2_frame, 'camera2', self._available_devices)
         
         # Configure grid weights
         parent.columnconfigure(0, weight=1)
         parent.columnconfigure(1, weight=1)
         parent.rowconfigure(0, weight=1)
     
-    def _create_single_camera_widgets(self, parent, camera_id):
+    def _create_single_camera_widgets(self, parent, camera_id, devices: List[str]):
         """Create widgets for a single camera."""
         # Enable checkbox
-        self.enable_vars[camera_id] = tk.BooleanVar(value=self.camera_config[camera_id]['enabled'])
+        self.enable_vars[camera_id] = tk.BooleanVar(value=self.camera_config[camera_id].enabled)
         ttk.Checkbutton(parent, text="Enable Camera", 
                        variable=self.enable_vars[camera_id]).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
         
         # Camera name
         ttk.Label(parent, text="Name:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        self.name_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id]['name'])
+        self.name_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id].name)
         ttk.Entry(parent, textvariable=self.name_vars[camera_id], width=20).grid(row=1, column=1, sticky=tk.W, pady=2, padx=(5, 0))
         
         # Camera type selection
         ttk.Label(parent, text="Type:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        self.type_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id]['type'])
+        self.type_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id].type)
         type_combo = ttk.Combobox(parent, textvariable=self.type_vars[camera_id], values=['device', 'url'], 
                                  state='readonly', width=15)
         type_combo.grid(row=2, column=1, sticky=tk.W, pady=2, padx=(5, 0))
@@ -169,19 +309,22 @@ class CameraConfigUI:
         # Device selection
         device_frame = ttk.Frame(parent)
         device_frame.grid(row=3, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=2)
+        self._device_frames[camera_id] = device_frame
         
         ttk.Label(device_frame, text="Device:").grid(row=0, column=0, sticky=tk.W)
-        self.device_vars[camera_id] = tk.StringVar(value=str(self.camera_config[camera_id]['device_index']))
+        self.device_vars[camera_id] = tk.StringVar(value=str(self.camera_config[camera_id].device_index))
         device_combo = ttk.Combobox(device_frame, textvariable=self.device_vars[camera_id], 
-                                   values=self._get_available_devices(), width=10)
+                                   values=devices, width=10)
         device_combo.grid(row=0, column=1, sticky=tk.W, padx=(5, 0))
+        self.device_combos[camera_id] = device_combo
         
         # URL input
         url_frame = ttk.Frame(parent)
         url_frame.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=2)
+        self._url_frames[camera_id] = url_frame
         
         ttk.Label(url_frame, text="URL:").grid(row=0, column=0, sticky=tk.W)
-        self.url_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id]['url'])
+        self.url_vars[camera_id] = tk.StringVar(value=self.camera_config[camera_id].url)
         url_entry = ttk.Entry(url_frame, textvariable=self.url_vars[camera_id], width=30)
         url_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(5, 0))
         
@@ -197,7 +340,7 @@ class CameraConfigUI:
         url_frame.columnconfigure(1, weight=1)
         
         # Show/hide appropriate widgets based on type
-        self._update_camera_widgets_visibility(camera_id, self.camera_config[camera_id]['type'])
+        self._update_camera_widgets_visibility(camera_id, self.camera_config[camera_id].type)
         
         # Preview frame
         preview_frame = ttk.LabelFrame(parent, text="Preview", padding="5")
@@ -211,75 +354,60 @@ class CameraConfigUI:
         parent.columnconfigure(1, weight=1)
         parent.rowconfigure(5, weight=1)
     
-    def _get_available_devices(self) -> List[str]:
-        """Get list of available camera devices."""
-        devices = []
-        for i in range(10):  # Check first 10 devices
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                devices.append(str(i))
-                cap.release()
-        return devices
+    @staticmethod
+    def _probe_device(index: int) -> Optional[int]:
+        """Return the device index if it can be opened, else None."""
+        cap = _lazy_cv2().VideoCapture(index, _capture_backend())
+        try:
+            return index if cap.isOpened() else None
+        finally:
+            cap.release()
+    
+    def _get_available_devices(self, refresh: bool = False) -> List[str]:
+        """Get list of available camera devices (cached unless refresh is set)."""
+        if self._device_cache is not None and not refresh:
+            return list(self._device_cache)
+        
+        # Probes are I/O bound, so run them concurrently and skip any that hang
+        found = []
+        executor = ThreadPoolExecutor(max_workers=10)
+        try:
+            futures = [executor.submit(self._probe_device, i) for i in _enumerate_device_indices()]
+            for future in as_completed(futures, timeout=DEVICE_PROBE_TIMEOUT):
+                index = future.result()
+                if index is not None:
+                    found.append(index)
+        except FuturesTimeoutError:
+            logger.warning("Timed out waiting for some camera device probes")
+        finally:
+            executor.shutdown(wait=False)
+        
+        self._device_cache = [str(i) for i in sorted(found)]
+        return list(self._device_cache)
     
     def _on_type_changed(self, camera_id: str, camera_type: str):
         """Handle camera type change."""
-        self.camera_config[camera_id]['type'] = camera_type
+        self.camera_config[camera_id].type = camera_type
         self._update_camera_widgets_visibility(camera_id, camera_type)
     
     def _update_camera_widgets_visibility(self, camera_id: str, camera_type: str):
         """Update widget visibility based on camera type."""
         try:
-            # Get the parent frame (camera1_frame or camera2_frame)
-            parent = None
-            for widget in self.root.winfo_children():
-                if hasattr(widget, 'winfo_children'):
-                    for child in widget.winfo_children():
-                        if hasattr(child, 'winfo_children'):
-                            for grandchild in child.winfo_children():
-                                if isinstance(grandchild, ttk.LabelFrame) and camera_id.replace('camera', 'Camera ') in grandchild.cget('text'):
-                                    parent = grandchild
-                                    break
-                            if parent:
-                                break
-                        if parent:
-                            break
-                if parent:
-                    break
+            device_frame = self._device_frames.get(camera_id)
+            url_frame = self._url_frames.get(camera_id)
             
-            if parent:
-                # Find device and URL frames
-                device_frame = None
-                url_frame = None
-                
-                for child in parent.winfo_children():
-                    if isinstance(child, ttk.Frame):
-                        # Check if this is the device frame (has "Device:" label)
-                        for grandchild in child.winfo_children():
-                            if isinstance(grandchild, ttk.Label) and grandchild.cget('text') == 'Device:':
-                                device_frame = child
-                                break
-                        if device_frame:
-                            break
-                
-                # Find URL frame (next frame after device frame)
-                if device_frame:
-                    for i, child in enumerate(parent.winfo_children()):
-                        if child == device_frame and i + 1 < len(parent.winfo_children()):
-                            url_frame = parent.winfo_children()[i + 1]
-                            break
-                
-                # Show/hide frames based on camera type
-                if device_frame:
-                    if camera_type == 'device':
-                        device_frame.grid()
-                    else:
-                        device_frame.grid_remove()
-                
-                if url_frame:
-                    if camera_type == 'url':
-                        url_frame.grid()
-                    else:
-                        url_frame.grid_remove()
+            # Show/hide frames based on camera type
+            if device_frame:
+                if camera_type == 'device':
+                    device_frame.grid()
+                else:
+                    device_frame.grid_remove()
+            
+            if url_frame:
+                if camera_type == 'url':
+                    url_frame.grid()
+                else:
+                    url_frame.grid_remove()
                         
         except Exception as e:
             logger.error(f"Error updating camera widgets visibility for {camera_id}: {e}")
@@ -309,6 +437,9 @@ class CameraConfigUI:
                 if self.enable_vars[camera_id].get():
                     self._test_single_camera(camera_id)
             
+            if self.test_cameras:
+                self._start_preview_pump()
+            
             messagebox.showinfo("Success", "Camera testing started. Check previews for live feeds.")
             
         except Exception as e:
@@ -321,63 +452,152 @@ class CameraConfigUI:
             # Get camera configuration
             config = self._get_camera_config(camera_id)
             
-            if config['type'] == 'device':
+            if config.type == 'device':
                 # Test device camera
-                cap = cv2.VideoCapture(int(config['device_index']))
+                cv2 = _lazy_cv2()
+                cap = cv2.VideoCapture(int(config.device_index), _capture_backend())
                 if not cap.isOpened():
-                    raise Exception(f"Could not open device {config['device_index']}")
+                    raise Exception(f"Could not open device {config.device_index}")
+                # Keep previews fresh and let the device deliver small frames
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
             else:
-                # Test URL camera with proper formatting
-                from camera_manager import CameraStream
-                temp_camera = CameraStream(config['url'], f"Test_{camera_id}", 'url')
-                if not temp_camera.start():
-                    raise Exception(f"Could not open URL: {config['url']}")
-                cap = temp_camera.cap
-                # Don't store temp_camera, just use its cap
-            
-            # Store camera instance
-            self.test_cameras[camera_id] = cap
+                # URL cameras can block for a long time while connecting, so
+                # open them off the Tk thread and poll for the result
+                future = self._url_open_executor.submit(self._open_url_camera, config.url, camera_id)
+                deadline = time.time() + URL_TEST_TIMEOUT
+                self.root.after(100, self._poll_url_camera, camera_id, config.url, future,
+                                deadline, self._test_generation)
+                return
             
-            # Start preview thread
-            thread = threading.Thread(target=self._preview_thread, args=(camera_id,), daemon=True)
-            thread.start()
-            self.preview_threads[camera_id] = thread
+            self._start_camera_preview(camera_id, cap)
             
         except Exception as e:
             logger.error(f"Error testing camera {camera_id}: {e}")
             messagebox.showerror("Error", f"Failed to test {camera_id}: {e}")
     
-    def _preview_thread(self, camera_id: str):
-        """Thread for camera preview."""
+    @staticmethod
+    def _open_url_camera(url: str, camera_id: str):
+        """Open a URL camera (runs in a worker thread)."""
+        # Test URL camera with proper formatting
+        from camera_manager import CameraStream
+        temp_camera = CameraStream(url, f"Test_{camera_id}", 'url')
+        if not temp_camera.start():
+            raise Exception(f"Could not open URL: {url}")
+        # Read through the stream itself: shot.jpg and direct MJPEG sources
+        # have no cv2 capture, and the stream's thread must be stopped on close
+        return _StreamCapture(temp_camera)
+    
+    def _poll_url_camera(self, camera_id: str, url: str, future, deadline: float, generation: int):
+        """Check whether a URL camera opened in the background is ready (Tk thread)."""
+        if generation != self._test_generation or not self.running:
+            # Testing was stopped meanwhile; release the capture once it opens
+            future.add_done_callback(self._release_future_capture)
+            return
+        
+        if not future.done():
+            if time.time() < deadline:
+                self.root.after(100, self._poll_url_camera, camera_id, url, future, deadline, generation)
+            else:
+                future.add_done_callback(self._release_future_capture)
+                logger.error(f"Timed out opening URL camera {camera_id}: {url}")
+                messagebox.showerror("Error", f"Failed to test {camera_id}: timed out opening {url}")
+            return
+        
         try:
-            cap = self.test_cameras.get(camera_id)
-            if cap is None:
-                return
+            self._start_camera_preview(camera_id, future.result())
+            self._start_preview_pump()
+        except Exception as e:
+            logger.error(f"Error testing camera {camera_id}: {e}")
+            messagebox.showerror("Error", f"Failed to test {camera_id}: {e}")
+    
+    @staticmethod
+    def _release_future_capture(future):
+        """Release the capture produced by an abandoned URL open."""
+        if not future.cancelled() and future.exception() is None:
+            future.result().release()
+    
+    def _start_camera_preview(self, camera_id: str, cap):
+        """Register an opened test camera and allocate its preview buffers."""
+        # Store camera instance
+        self.test_cameras[camera_id] = cap
+        self._start_preview_updates()
+        
+        ready = threading.Event()
+        ready.set()
+        self._preview_ready[camera_id] = ready
+        
+        # Preview buffers are allocated once and reused for every frame. The
+        # two photo images are used alternately so Tk never draws one while
+        # it is being refilled
+        width, height = PREVIEW_SIZE
+        self._preview_bufs[camera_id] = {
+            'bgr': np.empty((height, width, 3), np.uint8),
+            'rgb': np.empty((height, width, 3), np.uint8),
+            'photos': [ImageTk.PhotoImage('RGB', PREVIEW_SIZE, master=self.root),
+                       ImageTk.PhotoImage('RGB', PREVIEW_SIZE, master=self.root)],
+            'slot': 0,
+            'capture': None  # Sized on the first retrieved frame
+        }
+    
+    def _start_preview_pump(self):
+        """Start the shared preview thread if it isn't already running."""
+        if self._preview_pump_thread is not None and self._preview_pump_thread.is_alive():
+            return
+        # Each pump gets its own stop event so a stale pump can never be revived
+        self._pump_stop = threading.Event()
+        self._preview_pump_thread = threading.Thread(target=self._preview_pump, args=(self._pump_stop,),
+                                                     daemon=True)
+        self._preview_pump_thread.start()
+    
+    def _preview_pump(self, stop_event: threading.Event):
+        """Single thread that captures and converts preview frames for all test cameras."""
+        cv2 = _lazy_cv2()
+        try:
+            while not stop_event.is_set():
+                active = [(cid, cap) for cid, cap in list(self.test_cameras.items()) if cap.isOpened()]
+                if not active:
+                    break
                 
-            while camera_id in self.test_cameras and cap.isOpened():
-                ret, frame = cap.read()
-                if ret:
-                    # Resize frame for preview
-                    preview_frame = cv2.resize(frame, (320, 240))
+                # Grab on every camera first so the devices capture together,
+                # then decode only the frames that will actually be shown
+                grabbed = [(cid, cap) for cid, cap in active if cap.grab()]
+                for camera_id, cap in grabbed:
+                    bufs = self._preview_bufs.get(camera_id)
+                    ready = self._preview_ready.get(camera_id)
+                    # Skip conversion while the Tk thread hasn't shown the last frame
+                    if bufs is None or ready is None or not ready.is_set():
+                        continue
                     
-                    # Convert BGR to RGB
-                    rgb_frame = cv2.cvtColor(preview_frame, cv2.COLOR_BGR2RGB)
+                    # Decode into the reusable capture buffer where the backend
+                    # supports it, falling back to a freshly allocated frame
+                    ret = False
+                    if bufs['capture'] is not None:
+                        ret, frame = cap.retrieve(bufs['capture'])
+                    if not ret:
+                        ret, frame = cap.retrieve()
+                        if not ret:
+                            continue
+                        bufs['capture'] = np.empty_like(frame)
+                    ready.clear()
                     
-                    # Convert to PIL Image
-                    pil_image = Image.fromarray(rgb_frame)
-                    photo = ImageTk.PhotoImage(pil_image)
+                    # Resize (only if the camera didn't deliver preview size)
+                    # and convert BGR to RGB in place
+                    if frame.shape[1::-1] != PREVIEW_SIZE:
+                        frame = cv2.resize(frame, PREVIEW_SIZE, dst=bufs['bgr'])
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=bufs['rgb'])
                     
-                    # Update preview label (thread-safe)
-                    self.root.after(0, lambda: self._update_preview_label(camera_id, photo))
+                    # Hand the frame to the Tk thread; PIL and Tk image work
+                    # happens in _update_previews, which owns the interpreter
+                    with self._latest_frames_lock:
+                        self._latest_frames[camera_id] = bufs['rgb']
                 
-                time.sleep(0.033)  # ~30 FPS
+                stop_event.wait(1.0 / PREVIEW_FPS)
                 
         except Exception as e:
-            logger.error(f"Error in preview thread for {camera_id}: {e}")
-        finally:
-            # Clean up thread tracking
-            if camera_id in self.preview_threads:
-                del self.preview_threads[camera_id]
+            logger.error(f"Error in preview thread: {e}")
     
     def _update_preview_label(self, camera_id: str, photo):
         """Update preview label (called from main thread)."""
@@ -387,26 +607,52 @@ class CameraConfigUI:
                 self.preview_labels[camera_id].image = photo
         except Exception as e:
             logger.error(f"Error updating preview for {camera_id}: {e}")
+        finally:
+            ready = self._preview_ready.get(camera_id)
+            if ready is not None:
+                ready.set()
+    
+    def _start_preview_updates(self):
+        """Start the _update_previews tick if it isn't already running."""
+        if not self._previews_active:
+            self._previews_active = True
+            self._preview_tick_id = self.root.after(100, self._update_previews)
     
     def _update_previews(self):
         """Update camera previews."""
-        if not self.running:
+        # Only tick while cameras are being tested so an idle window stays idle
+        if not self.running or not self._previews_active or not self.test_cameras:
+            self._previews_active = False
+            self._preview_tick_id = None
             return
         
+        # Show the newest frame per camera; at most one update per tick. The
+        # pump won't touch the RGB buffer again until the label is updated
+        with self._latest_frames_lock:
+            latest, self._latest_frames = self._latest_frames, {}
+        for camera_id in latest:
+            bufs = self._preview_bufs.get(camera_id)
+            if bufs is None:
+                continue
+            photo = bufs['photos'][bufs['slot']]
+            bufs['slot'] ^= 1
+            photo.paste(_preview_image(bufs['rgb']))
+            self._update_preview_label(camera_id, photo)
+        
         # Schedule next update
-        self.root.after(100, self._update_previews)
+        self._preview_tick_id = self.root.after(100, self._update_previews)
     
-    def _get_camera_config(self, camera_id: str) -> Dict:
+    def _get_camera_config(self, camera_id: str) -> CameraCfg:
         """Get current camera configuration."""
         camera_type = self.type_vars[camera_id].get()
         
-        return {
-            'type': camera_type,
-            'device_index': int(self.device_vars[camera_id].get()) if camera_type == 'device' else 0,
-            'url': self.url_vars[camera_id].get(),
-            'name': self.name_vars[camera_id].get(),
-            'enabled': self.enable_vars[camera_id].get()
-        }
+        return CameraCfg(
+            type=camera_type,
+            device_index=int(self.device_vars[camera_id].get()) if camera_type == 'device' else 0,
+            url=self.url_vars[camera_id].get(),
+            name=self.name_vars[camera_id].get(),
+            enabled=self.enable_vars[camera_id].get()
+        )
     
     def _save_config(self):
         """Save camera configuration."""
@@ -415,10 +661,10 @@ class CameraConfigUI:
             for camera_id in ['camera1', 'camera2']:
                 self.camera_config[camera_id] = self._get_camera_config(camera_id)
             
-            # Save to file
+            # Save to file; always written, since it may have been changed or
+            # removed outside the app since it was loaded
             config_file = 'camera_config.json'
-            with open(config_file, 'w') as f:
-                json.dump(self.camera_config, f, indent=2)
+            _atomic_write(config_file, _dumps_config(self.camera_config))
             
             # Update config.py with camera indices
             self._update_config_py()
@@ -433,21 +679,20 @@ class CameraConfigUI:
         """Update config.py with camera configuration."""
         try:
             # Read current config.py
-            with open('config.py', 'r') as f:
+            with open('config.py', 'r', newline='') as f:
                 content = f.read()
             
             # Update camera indices
-            camera1_index = self.camera_config['camera1']['device_index'] if self.camera_config['camera1']['type'] == 'device' else 0
-            camera2_index = self.camera_config['camera2']['device_index'] if self.camera_config['camera2']['type'] == 'device' else 1
+            camera1_index = self.camera_config['camera1'].device_index if self.camera_config['camera1'].type == 'device' else 0
+            camera2_index = self.camera_config['camera2'].device_index if self.camera_config['camera2'].type == 'device' else 1
             
-            # Replace camera indices in config.py
-            import re
-            content = re.sub(r'CAMERA_1_INDEX = \d+', f'CAMERA_1_INDEX = {camera1_index}', content)
-            content = re.sub(r'CAMERA_2_INDEX = \d+', f'CAMERA_2_INDEX = {camera2_index}', content)
+            # Replace both camera indices in config.py in a single pass
+            indices = {1: camera1_index, 2: camera2_index}
+            new_content = _CAMERA_INDEX_RE.sub(lambda m: f'{m.group(1)} = {indices[int(m.group(2))]}', content)
             
-            # Write updated config.py
-            with open('config.py', 'w') as f:
-                f.write(content)
+            # Write updated config.py only if the indices actually changed
+            if new_content != content:
+                _atomic_write('config.py', new_content.encode('utf-8'))
             
         except Exception as e:
             logger.error(f"Error updating config.py: {e}")
@@ -458,7 +703,7 @@ class CameraConfigUI:
             config_file = 'camera_config.json'
             if os.path.exists(config_file):
                 with open(config_file, 'r') as f:
-                    self.camera_config = json.load(f)
+                    self.camera_config = _config_from_json(json.load(f))
                     
                 # Update GUI with loaded configuration
                 self._update_gui_from_config()
@@ -476,7 +721,7 @@ class CameraConfigUI:
             
             if config_file:
                 with open(config_file, 'r') as f:
-                    self.camera_config = json.load(f)
+                    self.camera_config = _config_from_json(json.load(f))
                 
                 self._update_gui_from_config()
                 messagebox.showinfo("Success", f"Configuration loaded from {config_file}")
@@ -492,48 +737,62 @@ class CameraConfigUI:
                 config = self.camera_config[camera_id]
                 
                 if camera_id in self.name_vars:
-                    self.name_vars[camera_id].set(config['name'])
+                    self.name_vars[camera_id].set(config.name)
                 if camera_id in self.device_vars:
-                    self.device_vars[camera_id].set(str(config['device_index']))
+                    self.device_vars[camera_id].set(str(config.device_index))
                 if camera_id in self.url_vars:
-                    self.url_vars[camera_id].set(config['url'])
+                    self.url_vars[camera_id].set(config.url)
                 if camera_id in self.enable_vars:
-                    self.enable_vars[camera_id].set(config['enabled'])
+                    self.enable_vars[camera_id].set(config.enabled)
                 if camera_id in self.type_vars:
-                    self.type_vars[camera_id].set(config['type'])
+                    self.type_vars[camera_id].set(config.type)
                     
         except Exception as e:
             logger.error(f"Error updating GUI from config: {e}")
     
     def _stop_test_cameras(self):
         """Stop all test cameras."""
-        # Create a copy of the keys to avoid "dictionary changed size during iteration" error
-        camera_ids = list(self.test_cameras.keys())
-        
-        for camera_id in camera_ids:
+        # Invalidate URL cameras still being opened in the background
+        self._test_generation += 1
+        
+        # Stop the Tk-side preview tick
+        self._previews_active = False
+        if self._preview_tick_id is not None:
+            self.root.after_cancel(self._preview_tick_id)
+            self._preview_tick_id = None
+        
+        # Detach the cameras in one swap; the pump only ever reads snapshots
+        # of self.test_cameras, so it sees either all of them or none
+        cameras, self.test_cameras = self.test_cameras, {}
+        
+        # Stop the preview thread before releasing the captures it reads from
+        pump = self._preview_pump_thread
+        self._preview_pump_thread = None
+        self._pump_stop.set()
+        if pump is not None:
+            pump.join(timeout=1.0)  # Wait up to 1 second
+        
+        if pump is not None and pump.is_alive():
+            # The pump is still blocked in grab()/retrieve(); release once it exits
+            threading.Thread(target=self._release_after, args=(pump, cameras), daemon=True).start()
+        else:
+            self._release_after(None, cameras)
+        
+        self._preview_bufs.clear()
+        self._preview_ready.clear()
+        with self._latest_frames_lock:
+            self._latest_frames.clear()
+    
+    @staticmethod
+    def _release_after(thread: Optional[threading.Thread], cameras: Dict):
+        """Release test camera captures, first waiting for thread to exit if given."""
+        if thread is not None:
+            thread.join()
+        for camera_id, cap in cameras.items():
             try:
-                cap = self.test_cameras.get(camera_id)
-                if cap is not None and cap.isOpened():
-                    cap.release()
-                # Remove from dictionary safely
-                if camera_id in self.test_cameras:
-                    del self.test_cameras[camera_id]
+                cap.release()
             except Exception as e:
                 logger.error(f"Error stopping test camera {camera_id}: {e}")
-                # Still try to remove from dictionary even if there's an error
-                if camera_id in self.test_cameras:
-                    del self.test_cameras[camera_id]
-        
-        # Wait for preview threads to finish
-        for camera_id, thread in list(self.preview_threads.items()):
-            try:
-                if thread.is_alive():
-                    thread.join(timeout=1.0)  # Wait up to 1 second
-            except Exception as e:
-                logger.error(f"Error waiting for preview thread {camera_id}: {e}")
-        
-        # Clear thread tracking
-        self.preview_threads.clear()
     
     def _create_menu(self):
         """Create application menu."""
@@ -563,11 +822,10 @@ class CameraConfigUI:
     def _refresh_devices(self):
         """Refresh available device list."""
         try:
-            devices = self._get_available_devices()
-            for camera_id in ['camera1', 'camera2']:
-                if camera_id in self.device_vars:
-                    current_value = self.device_vars[camera_id].get()
-                    self.device_vars[camera_id].set(current_value)
+            devices = self._get_available_devices(refresh=True)
+            self._available_devices = devices
+            for camera_id, device_combo in self.device_combos.items():
+                device_combo['values'] = devices
             
             messagebox.showinfo("Success", f"Found {len(devices)} available devices: {', '.join(devices)}")
             
@@ -628,6 +886,7 @@ Version: 1.0
         """Stop the configuration interface."""
         self.running = False
         self._stop_test_cameras()
+        self._url_open_executor.shutdown(wait=False)
         
         if self.root:
             self.root.quit()
@@ -10,19 +10,256 @@ import time
 import numpy as np
 import json
 import os
+import copy
+import itertools
+import http.client
+from collections import deque
+import multiprocessing
+from multiprocessing import shared_memory
+from urllib.parse import urlsplit
 from typing import Optional, Tuple, Dict
 import logging
 from config import *
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+except ImportError:
+    TurboJPEG = None
+
 # Configure logging
 logging.basicConfig(level=getattr(logging, LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+# libjpeg-turbo decoder for shot.jpg frames, falls back to cv2.imdecode when unavailable
+_TJ = None
+if TurboJPEG is not None:
+    try:
+        _TJ = TurboJPEG()
+    except Exception as e:
+        logger.debug(f"libturbojpeg not available, using cv2.imdecode: {e}")
+
+
+def _open_url_capture(url: str, backend: int = cv2.CAP_ANY) -> cv2.VideoCapture:
+    """Open a URL capture with bounded open/read timeouts so unreachable streams fail fast."""
+    params = [
+        cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, URL_OPEN_TIMEOUT_MSEC,
+        cv2.CAP_PROP_READ_TIMEOUT_MSEC, URL_READ_TIMEOUT_MSEC
+    ]
+    return cv2.VideoCapture(url, backend, params)
+
+
+# DCT scaling factors the decoders can apply while decoding, smallest first
+# (libjpeg-turbo only scales by n/8)
+_JPEG_SCALES = ((1, 8), (1, 4), (3, 8), (1, 2), (1, 1))
+_IMREAD_REDUCED = {
+    (1, 1): cv2.IMREAD_COLOR,
+    (1, 2): cv2.IMREAD_REDUCED_COLOR_2,
+    (1, 4): cv2.IMREAD_REDUCED_COLOR_4,
+    (1, 8): cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+_capture_cpus = itertools.count()  # Slots for streams created without an explicit cpu_slot
+_nice_warned = False
+
+
+def _tune_capture_thread(name: str, cpu_slot: Optional[int] = None):
+    """
+    Pin the calling capture thread to its own core and raise its priority (Linux only).
+    
+    Args:
+        name: Camera name for logging
+        cpu_slot: Index used to pick the core, e.g. the camera number. Capture
+            processes each have their own module state, so the caller has to
+            pass it for cameras to land on different cores
+    """
+    global _nice_warned
+    if not hasattr(os, 'sched_setaffinity'):
+        return
+    
+    if PIN_CAPTURE_THREADS:
+        try:
+            cpus = sorted(os.sched_getaffinity(0))
+            if len(cpus) > 1:
+                cpus = [cpu for cpu in cpus if cpu != 0]  # Leave core 0 to the main loop
+            if cpu_slot is None:
+                cpu_slot = next(_capture_cpus)
+            cpu = cpus[cpu_slot % len(cpus)]
+            os.sched_setaffinity(0, {cpu})
+            logger.debug(f"Pinned capture thread of {name} to CPU {cpu}")
+        except OSError as e:
+            logger.debug(f"Could not pin capture thread of {name}: {e}")
+    
+    if CAPTURE_THREAD_NICE:
+        try:
+            # Linux applies nice values per thread, so this leaves the rest of the process alone
+            os.nice(CAPTURE_THREAD_NICE)
+        except OSError as e:
+            # Usually missing privileges for a negative value; say so once, not per camera
+            if not _nice_warned:
+                _nice_warned = True
+                logger.warning(f"Could not change priority of capture threads (CAPTURE_THREAD_NICE={CAPTURE_THREAD_NICE}): {e}")
+
+
+def _pick_jpeg_scale(width: int, height: int) -> Tuple[int, int]:
+    """Pick the smallest decode scale that still yields at least FRAME_WIDTH x FRAME_HEIGHT."""
+    for num, den in _JPEG_SCALES:
+        if _TJ is None and (num, den) not in _IMREAD_REDUCED:
+            continue
+        if -(-width * num // den) >= FRAME_WIDTH and -(-height * num // den) >= FRAME_HEIGHT:
+            return (num, den)
+    return (1, 1)
+
+
+def _decode_jpeg(data, scale: Tuple[int, int] = (1, 1)) -> Optional[np.ndarray]:
+    """Decode a JPEG to a BGR frame, downscaling during decode and preferring libjpeg-turbo."""
+    if _TJ is not None:
+        return _TJ.decode(data, pixel_format=TJPF_BGR, scaling_factor=scale if scale != (1, 1) else None)
+    return cv2.imdecode(np.frombuffer(data, np.uint8), _IMREAD_REDUCED[scale])
+
+
+class _KeepAliveHTTP:
+    """Minimal HTTP client that keeps one persistent connection open to a camera."""
+    
+    def __init__(self, url: str, timeout: float = 2.0):
+        parts = urlsplit(url)
+        self.url = url
+        self._conn_cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self._timeout = timeout
+        self._headers = {'User-Agent': 'Mozilla/5.0', 'Connection': 'keep-alive'}
+        self._conn = None
+    
+    def get(self, method: str = 'GET') -> http.client.HTTPResponse:
+        """Issue a request on the pooled connection, reconnecting once if the server dropped it."""
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = self._conn_cls(self._host, self._port, timeout=self._timeout)
+            try:
+                self._conn.request(method, self._path, headers=self._headers)
+                return self._conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                self.close()
+                if attempt:
+                    raise
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class _RecvBuffer:
+    """Reusable receive buffer; HTTP bodies are read into it instead of into new bytes objects."""
+    
+    def __init__(self, size: int = 1 << 18):
+        self._buf = bytearray(size)
+    
+    def _grow(self, size: int, keep: int = 0):
+        if len(self._buf) < size:
+            grown = bytearray(max(size + size // 4, 2 * len(self._buf)))
+            grown[:keep] = self._buf[:keep]
+            self._buf = grown
+    
+    def read_exact(self, fp, size: int) -> Optional[memoryview]:
+        """Read exactly ``size`` bytes from ``fp``; None if the stream ended early."""
+        self._grow(size)
+        view = memoryview(self._buf)[:size]
+        pos = 0
+        while pos < size:
+            n = fp.readinto(view[pos:])
+            if not n:
+                return None
+            pos += n
+        return view
+    
+    def read_to_end(self, fp) -> memoryview:
+        """Read ``fp`` until EOF, growing the buffer as needed."""
+        pos = 0
+        while True:
+            if pos == len(self._buf):
+                self._grow(pos + 1, keep=pos)
+            n = fp.readinto(memoryview(self._buf)[pos:])
+            if not n:
+                return memoryview(self._buf)[:pos]
+            pos += n
+    
+    def read_until(self, fp, is_delimiter) -> Optional[memoryview]:
+        """Read lines from ``fp`` up to the first line matching ``is_delimiter``; None at EOF."""
+        pos = 0
+        while True:
+            line = fp.readline()
+            if not line:
+                return None
+            if is_delimiter(line):
+                break
+            end = pos + len(line)
+            self._grow(end, keep=pos)
+            self._buf[pos:end] = line
+            pos = end
+        # The CRLF in front of a boundary belongs to the boundary, not to the part
+        if self._buf[pos - 2:pos] == b'\r\n':
+            pos -= 2
+        return memoryview(self._buf)[:pos]
+
+
+class _MJPEGReader:
+    """Reads JPEG parts from a multipart/x-mixed-replace HTTP stream without FFmpeg."""
+    
+    def __init__(self, url: str, timeout: float):
+        self._http = _KeepAliveHTTP(url, timeout=timeout)
+        self._response = self._http.get()
+        self._recv = _RecvBuffer()
+        content_type = self._response.getheader('Content-Type') or ''
+        boundary = content_type.partition('boundary=')[2].split(';')[0].strip().strip('"')
+        if self._response.status != 200 or 'x-mixed-replace' not in content_type.lower() or not boundary:
+            self.close()
+            raise ValueError(f"Not an MJPEG stream (HTTP {self._response.status}, {content_type!r})")
+        # Cameras disagree on whether the declared boundary includes the leading dashes
+        self._boundary = boundary.lstrip('-').encode('latin-1')
+    
+    def _is_boundary(self, line: bytes) -> bool:
+        return line.startswith(b'--') and line.lstrip(b'-').startswith(self._boundary)
+    
+    def read_part(self) -> Optional[memoryview]:
+        """Return the body of the next part (valid until the next call), or None at end of stream."""
+        headers = {}
+        while True:
+            line = self._response.readline(4096)
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                if headers:
+                    break
+                continue
+            if self._is_boundary(line):
+                if line.endswith(self._boundary + b'--'):
+                    return None  # Closing boundary
+                continue
+            name, _, value = line.partition(b':')
+            headers[name.strip().lower()] = value.strip()
+        
+        # Exact-length read when the camera announces the part size, boundary scan otherwise
+        length = headers.get(b'content-length', b'')
+        if length.isdigit():
+            return self._recv.read_exact(self._response, int(length))
+        return self._recv.read_until(self._response, self._is_boundary)
+    
+    def close(self):
+        self._response.close()
+        self._http.close()
+
 
 class CameraStream:
     """Individual camera stream with threading support."""
     
-    def __init__(self, camera_source: str, name: str, camera_type: str = 'device'):
+    _adaptive_drop = True  # Skip decoding frames while get_frame() is not keeping up
+    
+    def __init__(self, camera_source: str, name: str, camera_type: str = 'device',
+                 cpu_slot: Optional[int] = None):
         """
         Initialize camera stream.
         
@@ -30,21 +267,41 @@ class CameraStream:
             camera_source: Camera device index (int) or URL (str)
             name: Camera name for logging
             camera_type: 'device' for device index, 'url' for URL/RTSP stream
+            cpu_slot: Index used to pick the core the capture thread is pinned to
         """
         self.camera_source = camera_source
         self.camera_type = camera_type
         self.name = name
+        self.cpu_slot = cpu_slot
         self.cap = None
         self.frame = None
         self.stopped = False
         self.thread = None
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Not used on the frame hand-off; kept for subclasses
+        # Single-producer/single-consumer slots: the producer fills the slot it is not publishing,
+        # then publishes it with one attribute store (atomic under the GIL), so readers never lock
+        self._buffers = [np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8) for _ in range(2)]
+        self._write_idx = 0
+        self._resize_src = None  # Source (height, width) the resize path was chosen for
+        self._resize_interp = None
+        # Frames published vs. frames the consumer has caught up to, used to shed load
+        self._produced = 0
+        self._consumed = 0
+        self._demand = threading.Event()  # Set by get_frame() to wake the URL polling loop
         self.last_frame_time = 0
         self.fps_counter = 0
         self.fps = 0
+        self._frame_times = deque(maxlen=30)
         self._shot_jpg_url = None  # Store shot.jpg URL for fallback
         self._mjpeg_error_count = 0  # Count MJPEG boundary errors
         self._max_mjpeg_errors = 5  # Max errors before switching to shot.jpg
+        self._http = None  # Keep-alive connection used for shot.jpg polling
+        self._use_direct_shot_jpg = False  # Poll shot.jpg over HTTP instead of reading self.cap
+        self._jpeg_scale = None  # Decode-time downscale, detected from the first frame
+        self._recv = _RecvBuffer()  # Reused receive buffer for shot.jpg bodies
+        self._use_direct_mjpeg = False  # Read MJPEG parts over HTTP instead of through FFmpeg
+        self._mjpeg_url = None
+        self._mjpeg = None
         
     def start(self) -> bool:
         """
@@ -57,24 +314,14 @@ class CameraStream:
             # Open camera based on type
             if self.camera_type == 'device':
                 self.cap = cv2.VideoCapture(int(self.camera_source))
+                opened = self.cap.isOpened()
             else:  # URL type
                 # Format URL for IP webcam compatibility
                 formatted_url = self._format_ip_webcam_url(self.camera_source)
                 logger.info(f"Opening URL camera {self.name} with formatted URL: {formatted_url}")
-                
-                # Test URL connectivity first
-                if not self._test_url_connectivity(formatted_url):
-                    logger.warning(f"URL connectivity test failed for {self.name}, but will try to open anyway")
-                
-                # Try different approaches for URL cameras
-                self.cap = self._open_url_camera(formatted_url)
-                
-                # Ensure shot.jpg URL is stored for fallback
-                if self.camera_type == 'url' and not self._shot_jpg_url:
-                    self._shot_jpg_url = formatted_url
-                    logger.info(f"Stored shot.jpg URL for {self.name}: {self._shot_jpg_url}")
+                opened = self._open_url_camera(formatted_url)
             
-            if not self.cap.isOpened():
+            if not opened:
                 logger.error(f"Failed to open camera {self.name} at source {self.camera_source}")
                 return False
             
@@ -83,6 +330,7 @@ class CameraStream:
                 self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
                 self.cap.set(cv2.CAP_PROP_FPS, FPS)
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep only the newest frame queued
             
             # Start thread
             self.thread = threading.Thread(target=self._update, daemon=True)
@@ -95,109 +343,94 @@ class CameraStream:
             logger.error(f"Error starting camera {self.name}: {e}")
             return False
     
-    def _open_url_camera(self, url: str) -> cv2.VideoCapture:
+    def _probe_content_type(self, url: str) -> str:
         """
-        Open URL camera with multiple fallback strategies.
-        Prioritizes shot.jpg for better reliability with IP webcams.
+        Sniff the Content-Type of a URL with a HEAD request on the keep-alive connection.
+        
+        Returns:
+            str: Lower-cased Content-Type, or '' if it could not be determined
+        """
+        try:
+            if self._http:
+                self._http.close()
+            self._http = _KeepAliveHTTP(url, timeout=2)
+            response = self._http.get('HEAD')
+            response.read()
+            if response.status != 200:
+                logger.debug(f"HEAD {url} returned HTTP {response.status}")
+                return ''
+            return (response.getheader('Content-Type') or '').lower()
+        except (http.client.HTTPException, OSError) as e:
+            logger.debug(f"Content-Type probe failed for {url}: {e}")
+            return ''
+    
+    def _open_url_camera(self, url: str) -> bool:
+        """
+        Open URL camera, choosing the capture path from the endpoint's Content-Type.
+        
+        Single-JPEG endpoints (shot.jpg) are polled directly over HTTP and MJPEG
+        streams are split into parts directly; anything else (or an MJPEG stream
+        the direct reader cannot parse) gets one FFMPEG VideoCapture.
         
         Args:
             url: Formatted URL
             
         Returns:
-            cv2.VideoCapture: OpenCV capture object
+            bool: True if the camera delivered a first frame
         """
         # Ensure URL has proper HTTP protocol
         if not url.startswith(('http://', 'https://')):
             url = 'http://' + url
             logger.info(f"Added HTTP protocol to URL: {url}")
         
-        # Strategy 1: Try with shot.jpg endpoint first (most reliable for IP webcams)
-        if '/shot.jpg' in url:
-            try:
-                logger.info(f"Attempting to open shot.jpg URL: {url}")
-                cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)  # Explicitly use FFMPEG backend for HTTP
-                if cap.isOpened():
-                    # Test if we can read a frame
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        logger.info(f"URL camera {self.name} opened successfully with shot.jpg endpoint")
-                        # Store the shot.jpg URL for later use
-                        self._shot_jpg_url = url
-                        return cap
-                    else:
-                        logger.warning(f"shot.jpg URL opened but failed to read frame")
-                        cap.release()
-                else:
-                    logger.warning(f"Failed to open shot.jpg URL: {url}")
-            except Exception as e:
-                logger.debug(f"shot.jpg URL opening failed: {e}")
+        self._use_direct_shot_jpg = False
+        self._use_direct_mjpeg = False
+        content_type = self._probe_content_type(url)
+        is_stream = content_type.startswith('multipart/')
         
-        # Strategy 2: Try with FFMPEG backend (preferred for HTTP URLs)
-        try:
-            logger.info(f"Attempting to open URL with FFMPEG backend: {url}")
-            cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
-            if cap.isOpened():
-                # Test if we can read a frame
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    logger.info(f"URL camera {self.name} opened successfully with FFMPEG backend")
-                    return cap
-                else:
-                    logger.warning(f"FFMPEG URL opened but failed to read frame")
-                    cap.release()
-            else:
-                logger.warning(f"Failed to open URL with FFMPEG backend: {url}")
-        except Exception as e:
-            logger.debug(f"FFMPEG backend URL opening failed: {e}")
+        if content_type.startswith('image/') or (not is_stream and '/shot.jpg' in url):
+            # Single JPEG per request: poll it directly, FFmpeg adds nothing here
+            self._shot_jpg_url = url
+            self._use_direct_shot_jpg = True
+            if self._get_url_frame() is not None:
+                logger.info(f"URL camera {self.name} opened with direct shot.jpg polling")
+                return True
+            logger.error(f"Failed to read a frame from shot.jpg URL for {self.name}: {url}")
+            self._use_direct_shot_jpg = False
+            return False
         
-        # Strategy 3: Try with default settings (fallback)
-        try:
-            logger.info(f"Attempting to open URL with default backend: {url}")
-            cap = cv2.VideoCapture(url)
-            if cap.isOpened():
-                # Test if we can read a frame
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    logger.info(f"URL camera {self.name} opened successfully with default settings")
-                    return cap
-                else:
-                    logger.warning(f"Default URL opened but failed to read frame")
-                    cap.release()
-            else:
-                logger.warning(f"Failed to open URL with default backend: {url}")
-        except Exception as e:
-            logger.debug(f"Default URL opening failed: {e}")
+        # Always store shot.jpg URL for fallback, even if we use video stream
+        if '/video' in url:
+            self._shot_jpg_url = url.replace('/video', '/shot.jpg')
+            logger.info(f"Stored shot.jpg URL for {self.name}: {self._shot_jpg_url}")
+        
+        if 'x-mixed-replace' in content_type:
+            # MJPEG: split parts ourselves (exact Content-Length reads) instead of going through FFmpeg
+            self._mjpeg_url = url
+            self._use_direct_mjpeg = True
+            if self._get_mjpeg_frame() is not None:
+                logger.info(f"URL camera {self.name} opened with direct MJPEG reader")
+                return True
+            logger.warning(f"Direct MJPEG reader failed for {self.name}, falling back to FFMPEG")
+            self._use_direct_mjpeg = False
+            self._close_mjpeg_stream()
         
-        # Strategy 4: Try with MJPEG-specific settings (least preferred due to boundary issues)
         try:
-            logger.info(f"Attempting to open URL with MJPEG settings: {url}")
-            cap = cv2.VideoCapture(url)
+            logger.info(f"Opening {content_type or 'unknown'} stream with FFMPEG backend: {url}")
+            cap = _open_url_capture(url, cv2.CAP_FFMPEG)
             if cap.isOpened():
-                # Set MJPEG-specific properties
                 cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer size
-                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc('M', 'J', 'P', 'G'))
-                
-                # Test if we can read a frame
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    logger.info(f"URL camera {self.name} opened successfully with MJPEG settings")
-                    return cap
-                else:
-                    logger.warning(f"MJPEG URL opened but failed to read frame")
-                    cap.release()
-            else:
-                logger.warning(f"Failed to open URL with MJPEG settings: {url}")
+                if cap.grab():
+                    self.cap = cap
+                    logger.info(f"URL camera {self.name} opened successfully with FFMPEG backend")
+                    return True
+                logger.warning("Stream URL opened but failed to read frame")
+            cap.release()
         except Exception as e:
-            logger.debug(f"MJPEG URL opening failed: {e}")
+            logger.debug(f"FFMPEG URL opening failed: {e}")
         
-        # Always store shot.jpg URL for fallback, even if we use video stream
-        if '/video' in url:
-            self._shot_jpg_url = url.replace('/video', '/shot.jpg')
-            logger.info(f"Stored shot.jpg URL for {self.name}: {self._shot_jpg_url}")
-        
-        # If all strategies fail, return a failed capture
-        logger.error(f"All URL opening strategies failed for {self.name} with URL: {url}")
-        return cv2.VideoCapture()
+        logger.error(f"Failed to open URL camera {self.name} with URL: {url}")
+        return False
     
     def _format_ip_webcam_url(self, url: str) -> str:
         """
@@ -241,85 +474,172 @@ class CameraStream:
         logger.debug(f"Formatted URL: {url}")
         return url
     
-    def _test_url_connectivity(self, url: str) -> bool:
+    def _get_url_frame(self) -> Optional[np.ndarray]:
         """
-        Test if URL is accessible.
+        Get frame from URL camera over a persistent keep-alive connection.
         
-        Args:
-            url: URL to test
-            
         Returns:
-            bool: True if URL is accessible
+            np.ndarray: Frame as numpy array, or None if failed
         """
         try:
-            import urllib.request
-            import urllib.error
+            if not self._shot_jpg_url:
+                return None
+            
+            if self._http is None or self._http.url != self._shot_jpg_url:
+                if self._http:
+                    self._http.close()
+                self._http = _KeepAliveHTTP(self._shot_jpg_url, timeout=2)
+                self._jpeg_scale = None
+            
+            # Make HTTP request to get image; the body is always read so the connection can be reused
+            response = self._http.get()
+            length = response.getheader('Content-Length')
+            if response.status != 200:
+                response.read()
+                logger.error(f"HTTP error {response.status} from {self.name}")
+                return None
+            
+            # Receive straight into the reusable buffer instead of allocating a bytes object per frame
+            if length and length.isdigit():
+                image_data = self._recv.read_exact(response, int(length))
+                if image_data is None:
+                    logger.debug(f"Truncated image from {self.name}")
+                    return None
+            else:
+                image_data = self._recv.read_to_end(response)
             
-            # Try to open the URL
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=5) as response:
-                return response.getcode() == 200
+            frame = self._decode_frame(image_data)
+            
+            if frame is not None:
+                return frame
+            else:
+                logger.warning(f"Failed to decode image from {self.name}")
+                return None
+                    
+        except (http.client.HTTPException, OSError) as e:
+            logger.debug(f"URL error for {self.name}: {e}")
+            return None
         except Exception as e:
-            logger.debug(f"URL connectivity test failed for {url}: {e}")
+            logger.debug(f"Error getting frame from {self.name}: {e}")
+            return None
+    
+    def _decode_frame(self, data) -> Optional[np.ndarray]:
+        """Decode a JPEG from a URL camera, picking the decode scale from the first frame."""
+        if self._jpeg_scale is None:
+            frame = _decode_jpeg(data)
+            if frame is not None:
+                self._jpeg_scale = _pick_jpeg_scale(frame.shape[1], frame.shape[0])
+                logger.debug(f"Decoding {self.name} JPEGs at scale {self._jpeg_scale}")
+            return frame
+        return _decode_jpeg(data, self._jpeg_scale)
+    
+    def _open_mjpeg_stream(self) -> bool:
+        """(Re)connect the direct MJPEG reader to the stream URL."""
+        self._close_mjpeg_stream()
+        try:
+            self._mjpeg = _MJPEGReader(self._mjpeg_url, timeout=URL_READ_TIMEOUT_MSEC / 1000)
+            return True
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.debug(f"Could not open MJPEG stream for {self.name}: {e}")
             return False
     
-    def _get_url_frame(self) -> Optional[np.ndarray]:
+    def _close_mjpeg_stream(self):
+        if self._mjpeg is not None:
+            self._mjpeg.close()
+            self._mjpeg = None
+    
+    def _get_mjpeg_frame(self, decode: bool = True) -> Optional[np.ndarray]:
         """
-        Get frame from URL camera using urllib (fallback method).
+        Read the next part of the direct MJPEG stream.
         
+        Args:
+            decode: False to consume the part without decoding it (frame dropping)
+            
         Returns:
-            np.ndarray: Frame as numpy array, or None if failed
+            np.ndarray: Frame as numpy array, or None if failed or not decoded
         """
         try:
-            import urllib.request
-            import urllib.error
+            if self._mjpeg is None and not self._open_mjpeg_stream():
+                return None
             
-            if not self._shot_jpg_url:
+            data = self._mjpeg.read_part()
+            if data is None:
+                logger.warning(f"MJPEG stream from {self.name} ended, reconnecting")
+                self._close_mjpeg_stream()
+                return None
+            if not decode:
                 return None
             
-            # Make HTTP request to get image
-            req = urllib.request.Request(self._shot_jpg_url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=2) as response:
-                if response.getcode() == 200:
-                    # Read image data
-                    image_data = response.read()
-                    
-                    # Convert to numpy array
-                    nparr = np.frombuffer(image_data, np.uint8)
-                    frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-                    
-                    if frame is not None:
-                        return frame
-                    else:
-                        logger.warning(f"Failed to decode image from {self.name}")
-                        return None
-                else:
-                    logger.error(f"HTTP error {response.getcode()} from {self.name}")
-                    return None
-                    
-        except urllib.error.URLError as e:
-            logger.debug(f"URL error for {self.name}: {e}")
-            return None
-        except Exception as e:
-            logger.debug(f"Error getting frame from {self.name}: {e}")
+            frame = self._decode_frame(data)
+            if frame is None:
+                logger.warning(f"Failed to decode MJPEG part from {self.name}")
+            return frame
+            
+        except (http.client.HTTPException, OSError, ValueError) as e:
+            logger.debug(f"MJPEG read error for {self.name}: {e}")
+            self._close_mjpeg_stream()
             return None
     
     def _update(self):
         """Update loop for camera frame capture."""
+        _tune_capture_thread(self.name, self.cpu_slot)
         consecutive_errors = 0
         max_consecutive_errors = 10
+        frame_interval = 1.0 / FPS
+        last_retrieve = time.monotonic()
+        capture_count = 0
+        dropped = 0
+        overflow_since = None
+        last_drop_log = last_retrieve
         
         while not self.stopped:
             try:
-                if self.cap is None or not self.cap.isOpened():
+                direct = self._use_direct_shot_jpg or self._use_direct_mjpeg
+                if not direct and (self.cap is None or not self.cap.isOpened()):
                     logger.error(f"Camera {self.name} is not available")
                     break
                 
-                # For URL cameras, try to get frame using urllib if OpenCV fails
-                if self.camera_type == 'url' and self._shot_jpg_url:
+                # Shed decode work while the consumer is behind: every 2nd frame, every 4th after 1s
+                now = time.monotonic()
+                if self._adaptive_drop and self._produced - self._consumed > FRAME_DROP_THRESHOLD:
+                    if overflow_since is None:
+                        overflow_since = now
+                    skip_every = 4 if now - overflow_since >= 1.0 else 2
+                else:
+                    overflow_since = None
+                    skip_every = 1
+                
+                if now - last_drop_log >= 5.0:
+                    if dropped:
+                        logger.info(f"Camera {self.name} dropped {dropped} frames in the last 5s (consumer behind)")
+                    dropped = 0
+                    last_drop_log = now
+                
+                capture_count += 1
+                if capture_count % skip_every:
+                    # Skip this frame without decoding it
+                    if self._use_direct_shot_jpg:
+                        time.sleep(frame_interval)
+                    elif self._use_direct_mjpeg:
+                        self._get_mjpeg_frame(decode=False)
+                    else:
+                        self.cap.grab()
+                    dropped += 1
+                    continue
+                
+                # shot.jpg and MJPEG cameras are read over HTTP, everything else from VideoCapture
+                if self._use_direct_shot_jpg:
                     frame = self._get_url_frame()
+                elif self._use_direct_mjpeg:
+                    frame = self._get_mjpeg_frame()
                 else:
-                    ret, frame = self.cap.read()
+                    # Drain queued frames with grab() (no decode) and decode only the newest one
+                    # A failed grab ends the drain but doesn't discard a frame grabbed before it
+                    grabbed = ok = self.cap.grab()
+                    while ok and time.monotonic() - last_retrieve < frame_interval:
+                        ok = self.cap.grab()
+                    ret, frame = self.cap.retrieve() if grabbed else (False, None)
+                    last_retrieve = time.monotonic()
                     if not ret or frame is None:
                         frame = None
                 
@@ -327,25 +647,20 @@ class CameraStream:
                     # Reset error counter on successful frame
                     consecutive_errors = 0
                     
-                    # Resize frame to configured size
+                    # Resize frame to configured size straight into the unpublished slot
+                    back = self._buffers[self._write_idx]
                     try:
-                        frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+                        self._resize_into(frame, back)
                     except Exception as resize_error:
                         logger.warning(f"Frame resize error for {self.name}: {resize_error}")
                         continue
                     
-                    with self.lock:
-                        self.frame = frame.copy()
-                        self.last_frame_time = time.time()
+                    self._publish(back)
                     
-                    # Calculate FPS
-                    self.fps_counter += 1
-                    if self.fps_counter % 30 == 0:
-                        self.fps = 30 / (time.time() - self.last_frame_time + 0.001)
-                    
-                    # For URL cameras, add minimal delay for better performance
-                    if self.camera_type == 'url':
-                        time.sleep(0.01)  # 10ms delay for URL cameras
+                    # For shot.jpg polling, fetch again as soon as a frame is read, or one frame interval later at most
+                    if self._use_direct_shot_jpg:
+                        self._demand.wait(timeout=max(0.0, now + frame_interval - time.monotonic()))
+                        self._demand.clear()
                         
                 else:
                     consecutive_errors += 1
@@ -395,17 +710,62 @@ class CameraStream:
                     logger.error(f"Too many consecutive errors for camera {self.name}, stopping")
                     break
     
-    def get_frame(self) -> Optional[np.ndarray]:
+    def _resize_into(self, frame: np.ndarray, back: np.ndarray):
+        """Scale a frame into a slot, choosing the resize path once per source resolution."""
+        if frame.shape[:2] != self._resize_src:
+            self._resize_src = frame.shape[:2]
+            src_h, src_w = self._resize_src
+            if (src_w, src_h) == (FRAME_WIDTH, FRAME_HEIGHT):
+                self._resize_interp = None
+            elif src_w % FRAME_WIDTH == 0 and src_h % FRAME_HEIGHT == 0:
+                # Integer downscale: OpenCV runs INTER_AREA as a fixed box filter for these ratios
+                self._resize_interp = cv2.INTER_AREA
+            else:
+                self._resize_interp = cv2.INTER_LINEAR
+            logger.debug(f"Resizing {self.name} frames from {src_w}x{src_h} with interpolation {self._resize_interp}")
+        
+        if self._resize_interp is None:
+            np.copyto(back, frame)
+        else:
+            cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT), dst=back, interpolation=self._resize_interp)
+    
+    def _publish(self, back: np.ndarray):
+        """Make a filled slot the current frame and switch writing to the other slot."""
+        self.frame = back
+        self._write_idx ^= 1
+        self._produced += 1
+        
+        # FPS over the last 30 frames from a ring of monotonic timestamps
+        now = time.monotonic()
+        self._frame_times.append(now)
+        self.last_frame_time = now
+        span = now - self._frame_times[0]
+        if span > 0:
+            self.fps = (len(self._frame_times) - 1) / span
+    
+    def get_frame(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """
         Get the latest frame from camera.
         
+        The returned array is the stream's front buffer and is reused by the
+        capture thread, so callers must not modify it and should pass ``out``
+        if they need to keep the frame across several capture intervals.
+        
+        Args:
+            out: Optional preallocated array the frame is copied into
+            
         Returns:
             np.ndarray: Latest frame or None if not available
         """
-        with self.lock:
-            if self.frame is not None:
-                return self.frame.copy()
-        return None
+        frame = self.frame
+        if frame is None:
+            return None
+        self._consumed = self._produced
+        self._demand.set()
+        if out is not None:
+            np.copyto(out, frame)
+            return out
+        return frame
     
     def get_fps(self) -> float:
         """Get current FPS of the camera."""
@@ -414,6 +774,7 @@ class CameraStream:
     def stop(self):
         """Stop camera stream."""
         self.stopped = True
+        self._demand.set()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=CAMERA_THREAD_TIMEOUT)
         
@@ -421,6 +782,11 @@ class CameraStream:
             self.cap.release()
             self.cap = None
         
+        if self._http:
+            self._http.close()
+            self._http = None
+        self._close_mjpeg_stream()
+        
         logger.info(f"Camera {self.name} stopped")
     
     def restart(self) -> bool:
@@ -467,7 +833,7 @@ class CameraStream:
         return self.restart()
     
     def _switch_to_shot_jpg_mode(self) -> bool:
-        """Switch to shot.jpg mode for URL cameras."""
+        """Switch to shot.jpg mode for URL cameras, polling it directly instead of via VideoCapture."""
         if not self._shot_jpg_url:
             logger.warning(f"No shot.jpg URL available for {self.name}")
             return False
@@ -475,16 +841,14 @@ class CameraStream:
         try:
             logger.info(f"Switching {self.name} to shot.jpg mode: {self._shot_jpg_url}")
             
-            # Close current capture
+            # Close current capture and stream reader
             if self.cap:
                 self.cap.release()
+                self.cap = None
+            self._use_direct_mjpeg = False
+            self._close_mjpeg_stream()
             
-            # Open shot.jpg capture
-            self.cap = cv2.VideoCapture(self._shot_jpg_url)
-            if not self.cap.isOpened():
-                logger.error(f"Failed to open shot.jpg for {self.name}")
-                return False
-            
+            self._use_direct_shot_jpg = True
             logger.info(f"Successfully switched {self.name} to shot.jpg mode")
             return True
             
@@ -493,6 +857,193 @@ class CameraStream:
             return False
 
 
+class _SharedMemoryStream(CameraStream):
+    """CameraStream that captures into shared-memory slots and publishes the slot index."""
+    
+    _adaptive_drop = False  # The consumer lives in the parent process, so reads are not counted here
+    
+    def __init__(self, camera_source: str, name: str, camera_type: str, slots: np.ndarray, published, fps,
+                 cpu_slot: Optional[int] = None):
+        super().__init__(camera_source, name, camera_type, cpu_slot)
+        self._buffers = [slots[0], slots[1]]
+        self._published = published
+        self._shared_fps = fps
+    
+    def _publish(self, back: np.ndarray):
+        # Publish a frame sequence number; frame n always lands in slot n & 1
+        self._published.value = self._produced
+        super()._publish(back)
+        self._shared_fps.value = self.fps
+
+
+def _run_capture_process(camera_source, name, camera_type, shm_name, published, fps, status, stop_event,
+                         cpu_slot=None):
+    """Entry point of a capture child process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = stream = None
+    try:
+        slots = np.ndarray((2, FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8, buffer=shm.buf)
+        stream = _SharedMemoryStream(camera_source, name, camera_type, slots, published, fps, cpu_slot)
+        if not stream.start():
+            status.value = -1
+            return
+        status.value = 1
+        while not stop_event.wait(0.5) and stream.thread.is_alive():
+            pass
+    except Exception as e:
+        logger.error(f"Error in capture process for {name}: {e}")
+        status.value = -1
+    finally:
+        if stream is not None:
+            stream.stop()
+            # Drop every view into the segment before closing it
+            stream.frame = None
+            stream._buffers = None
+        slots = None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # Capture thread did not exit in time; the segment is released with the process
+
+
+class CameraProcess:
+    """
+    Runs a CameraStream in a separate process so capture and JPEG decode never
+    compete with detection for the GIL. Frames are shared through two
+    shared-memory slots; the child publishes the sequence number of the newest
+    frame, which also identifies its slot.
+    """
+    
+    def __init__(self, camera_source: str, name: str, camera_type: str = 'device',
+                 cpu_slot: Optional[int] = None):
+        self.camera_source = camera_source
+        self.camera_type = camera_type
+        self.name = name
+        self.cpu_slot = cpu_slot
+        self.process = None
+        self._shm = None
+        self._slots = None
+        self._published = None
+        self._fps = None
+        self._stop_event = None
+        self._frame = None  # Parent-side copy returned when no out buffer is given
+    
+    @property
+    def stopped(self) -> bool:
+        return self.process is None or not self.process.is_alive()
+    
+    def start(self) -> bool:
+        """
+        Start the capture process and wait until the camera has opened.
+        
+        Returns:
+            bool: True if camera started successfully
+        """
+        try:
+            ctx = multiprocessing.get_context('spawn')
+            self._shm = shared_memory.SharedMemory(create=True, size=2 * FRAME_HEIGHT * FRAME_WIDTH * 3)
+            self._slots = np.ndarray((2, FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8, buffer=self._shm.buf)
+            self._published = ctx.RawValue('q', -1)
+            self._fps = ctx.RawValue('d', 0.0)
+            status = ctx.RawValue('i', 0)
+            self._stop_event = ctx.Event()
+            self.process = ctx.Process(
+                target=_run_capture_process,
+                args=(self.camera_source, self.name, self.camera_type, self._shm.name,
+                      self._published, self._fps, status, self._stop_event, self.cpu_slot),
+                name=f"capture-{self.name}",
+                daemon=True
+            )
+            self.process.start()
+            
+            deadline = time.monotonic() + CAMERA_PROCESS_START_TIMEOUT
+            while status.value == 0 and self.process.is_alive() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            
+            if status.value != 1:
+                logger.error(f"Capture process for camera {self.name} failed to start")
+                self.stop()
+                return False
+            
+            logger.info(f"Camera {self.name} started in capture process {self.process.pid}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error starting capture process for camera {self.name}: {e}")
+            self.stop()
+            return False
+    
+    def get_frame(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Get the latest frame from the capture process.
+        
+        The shared slots are refilled by the child without waiting for this
+        process, so the frame is always copied out, into ``out`` if given or
+        else into a buffer owned by this object. A copy that overlapped the
+        publication of a newer frame is retried.
+        """
+        if self._published is None:
+            return None
+        if out is None:
+            if self._frame is None:
+                self._frame = np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8)
+            out = self._frame
+        for _ in range(3):
+            seq = self._published.value
+            if seq < 0:
+                return None
+            np.copyto(out, self._slots[seq & 1])
+            # The child only starts overwriting this slot after publishing seq + 1
+            if self._published.value == seq:
+                break
+        return out
+    
+    def get_fps(self) -> float:
+        """Get current FPS of the camera."""
+        return self._fps.value if self._fps is not None else 0
+    
+    def stop(self):
+        """Stop the capture process and free the shared memory."""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=CAMERA_THREAD_TIMEOUT + 1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1.0)
+        
+        self._slots = None
+        self._published = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+                self._shm.unlink()
+            except Exception as e:
+                logger.debug(f"Error releasing shared memory for {self.name}: {e}")
+            self._shm = None
+        
+        logger.info(f"Camera {self.name} stopped")
+
+
+# Used when camera_config.json is missing or unreadable
+_DEFAULT_CAMERA_CONFIG = {
+    'camera1': {
+        'type': 'device',
+        'device_index': CAMERA_1_INDEX,
+        'url': '',
+        'name': 'Camera 1',
+        'enabled': True
+    },
+    'camera2': {
+        'type': 'device',
+        'device_index': CAMERA_2_INDEX,
+        'url': '',
+        'name': 'Camera 2',
+        'enabled': True
+    }
+}
+
+
 class CameraManager:
     """Manages multiple camera streams."""
     
@@ -500,6 +1051,14 @@ class CameraManager:
         """Initialize camera manager."""
         self.cameras = {}
         self.running = False
+        self._config = None
+        self._config_mtime = None
+        # Manager-owned copies handed out by get_frames, so callers never hold
+        # a capture slot that the stream may refill while they still use it
+        self._frame_bufs = {
+            "camera1": np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8),
+            "camera2": np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), np.uint8)
+        }
         
     def initialize_cameras(self) -> bool:
         """
@@ -511,14 +1070,17 @@ class CameraManager:
         logger.info("Initializing cameras...")
         
         # Load camera configuration
-        camera_config = self._load_camera_config()
+        camera_config = self._cached_camera_config()
+        
+        stream_cls = CameraProcess if CAPTURE_IN_SUBPROCESS else CameraStream
         
         # Initialize camera 1
         if camera_config['camera1']['enabled']:
-            camera1 = CameraStream(
+            camera1 = stream_cls(
                 str(camera_config['camera1']['device_index']) if camera_config['camera1']['type'] == 'device' else camera_config['camera1']['url'],
                 camera_config['camera1']['name'],
-                camera_config['camera1']['type']
+                camera_config['camera1']['type'],
+                cpu_slot=0
             )
             if not camera1.start():
                 logger.error("Failed to start Camera 1")
@@ -529,10 +1091,11 @@ class CameraManager:
         
         # Initialize camera 2
         if camera_config['camera2']['enabled']:
-            camera2 = CameraStream(
+            camera2 = stream_cls(
                 str(camera_config['camera2']['device_index']) if camera_config['camera2']['type'] == 'device' else camera_config['camera2']['url'],
                 camera_config['camera2']['name'],
-                camera_config['camera2']['type']
+                camera_config['camera2']['type'],
+                cpu_slot=1
             )
             if not camera2.start():
                 logger.error("Failed to start Camera 2")
@@ -552,6 +1115,17 @@ class CameraManager:
         logger.info("All cameras initialized successfully")
         return True
     
+    def _cached_camera_config(self) -> Dict:
+        """Return the parsed camera configuration, re-reading it only when the file has changed."""
+        try:
+            mtime = os.stat('camera_config.json').st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._config is None or mtime != self._config_mtime:
+            self._config = self._load_camera_config()
+            self._config_mtime = mtime
+        return self._config
+    
     def _load_camera_config(self) -> Dict:
         """Load camera configuration from file or use defaults."""
         try:
@@ -561,54 +1135,29 @@ class CameraManager:
                     return json.load(f)
             else:
                 # Return default configuration
-                return {
-                    'camera1': {
-                        'type': 'device',
-                        'device_index': CAMERA_1_INDEX,
-                        'url': '',
-                        'name': 'Camera 1',
-                        'enabled': True
-                    },
-                    'camera2': {
-                        'type': 'device',
-                        'device_index': CAMERA_2_INDEX,
-                        'url': '',
-                        'name': 'Camera 2',
-                        'enabled': True
-                    }
-                }
+                return copy.deepcopy(_DEFAULT_CAMERA_CONFIG)
         except Exception as e:
             logger.error(f"Error loading camera configuration: {e}")
             # Return default configuration on error
-            return {
-                'camera1': {
-                    'type': 'device',
-                    'device_index': CAMERA_1_INDEX,
-                    'url': '',
-                    'name': 'Camera 1',
-                    'enabled': True
-                },
-                'camera2': {
-                    'type': 'device',
-                    'device_index': CAMERA_2_INDEX,
-                    'url': '',
-                    'name': 'Camera 2',
-                    'enabled': True
-                }
-            }
+            return copy.deepcopy(_DEFAULT_CAMERA_CONFIG)
     
     def get_frames(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
         """
         Get frames from both cameras.
         
+        The frames are copied into buffers owned by the manager, which stay
+        valid until the next call to get_frames.
+        
         Returns:
             Tuple: (frame1, frame2) or (None, None) if not available
         """
         if not self.running:
             return None, None
         
-        frame1 = self.cameras["camera1"].get_frame() if self.cameras["camera1"] else None
-        frame2 = self.cameras["camera2"].get_frame() if self.cameras["camera2"] else None
+        camera1 = self.cameras["camera1"]
+        camera2 = self.cameras["camera2"]
+        frame1 = camera1.get_frame(out=self._frame_bufs["camera1"]) if camera1 else None
+        frame2 = camera2.get_frame(out=self._frame_bufs["camera2"]) if camera2 else None
         
         return frame1, frame2
     
@@ -5,6 +5,8 @@ Configuration settings for the multi-camera object tracking system.
 # Camera Configuration
 CAMERA_1_INDEX = 0  # First camera device index
 CAMERA_2_INDEX = 1  # Second camera device index
+DEVICE_PROBE_TIMEOUT = 2.0  # Max seconds to wait for camera device probes
+CAMERA_CHECK_CACHE_TTL = 3600  # Seconds main.py reuses its startup camera check results
 
 # Frame Configuration
 FRAME_WIDTH = 640
@@ -15,7 +17,18 @@ FPS = 30
 URL_CAMERA_BUFFER_SIZE = 1  # Reduce buffer size for MJPEG streams
 URL_CAMERA_TIMEOUT = 5  # Timeout for URL camera operations
 URL_CAMERA_RETRY_ATTEMPTS = 3  # Number of retry attempts for URL cameras
+URL_OPEN_TIMEOUT_MSEC = 3000  # Max time for OpenCV to open a URL stream
+URL_READ_TIMEOUT_MSEC = 2000  # Max time for OpenCV to read a frame from a URL stream
 CAMERA_THREAD_TIMEOUT = 2.0  # Timeout for camera thread operations
+FRAME_DROP_THRESHOLD = 2  # Unread frames after which capture starts skipping decodes
+PIN_CAPTURE_THREADS = True  # Pin each capture thread to its own CPU core (Linux only)
+CAPTURE_THREAD_NICE = 0  # Niceness adjustment for capture threads (needs privileges to go below 0; 0 = off)
+CAPTURE_IN_SUBPROCESS = False  # Run each camera's capture loop in its own process (avoids GIL contention)
+CAMERA_PROCESS_START_TIMEOUT = 15.0  # Max seconds to wait for a capture process to open its camera
+
+# Camera Configuration UI
+PREVIEW_FPS = 10  # Frame rate of the live previews in the configuration tool
+URL_TEST_TIMEOUT = 10.0  # Max seconds to wait for a URL camera to open when testing
 
 # Display Configuration
 DISPLAY_WIDTH = 640   # Display window width (can be different from capture)
@@ -33,8 +46,13 @@ MAX_OBJECT_SIZE = 200000  # Maximum object size in pixels (increased for better
 
 # YOLOv8 Configuration
 YOLO_MODEL = 'yolov8s.pt'  # Model size: n(nano), s(small), m(medium), l(large), x(xlarge)
+YOLO_ENGINE = 'yolov8s.engine'  # TensorRT FP16 export of YOLO_MODEL, used by the tracker when present
 YOLO_IOU_THRESHOLD = 0.45
 YOLO_CONF_THRESHOLD = 0.3  # Increased for better quality detections
+SIMULATE_SECOND_CAMERA = True  # Single-camera demos mirror camera 1 into camera 2 (detected once)
+YOLO_BATCH_SIZE = 8  # Frames per batched YOLO call in offline demo/debug loops
+YOLO_FUSED_PREPROCESS = True  # Build YOLO input tensors with one Numba pass when numba is installed
+DEMO_CUDA_RESIZE = True  # Resize demo frames with cv2.cuda when OpenCV was built with CUDA
 TRACK_CLASSES = ["car"]  # Common objects to track
 
 # Common YOLO classes you might want to track:
@@ -147,4 +165,8 @@ PROCESSING_THREAD_TIMEOUT = 0.1  # seconds
 # Debug Configuration
 DEBUG_MODE = True
 SAVE_FRAMES = False
-LOG_LEVEL = "INFO" 
\ No newline at end of file
+LOG_LEVEL = "INFO"
+LOG_FILE = "multi_camera_tracking.log"  # Application log, rotated by logging_setup
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Size at which the log file is rotated
+LOG_BACKUP_COUNT = 3  # Rotated log files to keep
+DEBUG_PRINT_EVERY = 10  # Frames between detailed per-frame reports in debug scripts 
\ No newline at end of file
@@ -4,8 +4,11 @@ Demonstration script for YOLOv8 + DeepSORT multi-camera tracking
 
 import cv2
 import numpy as np
+import queue
+import threading
 import time
 import logging
+from typing import Optional
 from object_tracker import ObjectTracker
 from config import *
 
@@ -13,6 +16,91 @@ from config import *
 logging.basicConfig(level=getattr(logging, LOG_LEVEL))
 logger = logging.getLogger(__name__)
 
+def _cuda_resize_available() -> bool:
+    """Check whether OpenCV was built with CUDA and can see a device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+class _FrameResizer:
+    """Resizes frames to the configured size, on the GPU when cv2.cuda is usable."""
+    
+    def __init__(self, width: int, height: int):
+        self.size = (width, height)
+        self.use_cuda = DEMO_CUDA_RESIZE and _cuda_resize_available()
+        if self.use_cuda:
+            # Device buffers are reused across frames instead of reallocated
+            self.gpu_src = cv2.cuda_GpuMat()
+            self.gpu_dst = cv2.cuda_GpuMat()
+            logger.info("Resizing demo frames with cv2.cuda")
+    
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        if (frame.shape[1], frame.shape[0]) == self.size:
+            return frame
+        if self.use_cuda:
+            try:
+                self.gpu_src.upload(frame)
+                cv2.cuda.resize(self.gpu_src, self.size, self.gpu_dst)
+                return self.gpu_dst.download()
+            except cv2.error as e:
+                logger.error(f"CUDA resize failed, falling back to CPU: {e}")
+                self.use_cuda = False
+        return cv2.resize(frame, self.size)
+
+
+class _FrameReader:
+    """Reads frames on a background thread so capture overlaps with inference."""
+    
+    def __init__(self, cap: cv2.VideoCapture, drop_oldest: bool):
+        self.cap = cap
+        self.drop_oldest = drop_oldest  # Live sources drop stale frames, files keep every frame
+        self.frames = queue.Queue(maxsize=2)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def _put(self, item):
+        if self.drop_oldest:
+            try:
+                self.frames.put_nowait(item)
+            except queue.Full:
+                try:
+                    self.frames.get_nowait()
+                except queue.Empty:
+                    pass
+                self.frames.put_nowait(item)
+        else:
+            while not self.stopped.is_set():
+                try:
+                    self.frames.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+    
+    def _run(self):
+        while not self.stopped.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self._put(frame)
+        self._put(None)  # End of stream
+    
+    def read(self) -> Optional[np.ndarray]:
+        """Return the next frame, or None once the source has no more frames."""
+        while True:
+            try:
+                return self.frames.get(timeout=CAMERA_THREAD_TIMEOUT)
+            except queue.Empty:
+                if not self.thread.is_alive():
+                    return None
+    
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=CAMERA_THREAD_TIMEOUT)
+
+
 def demo_yolo_deepsort():
     """Demonstrate YOLOv8 + DeepSORT tracking with webcam."""
     
@@ -39,46 +127,60 @@ def demo_yolo_deepsort():
         print("✗ Could not open webcam")
         return False
     
-    # Set camera properties
+    # Set camera properties; MJPG keeps USB bandwidth and decode cost low at higher resolutions
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
     cap.set(cv2.CAP_PROP_FPS, FPS)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, URL_CAMERA_BUFFER_SIZE)  # Don't let stale frames queue up in the driver
     
     print("✓ Webcam opened successfully")
     
     frame_count = 0
     start_time = time.time()
     save_frame = False
+    reader = _FrameReader(cap, drop_oldest=True)
+    resize = _FrameResizer(FRAME_WIDTH, FRAME_HEIGHT)
+    simulate_second_camera = SIMULATE_SECOND_CAMERA  # Local lookup in the per-frame loop
+    fps_ema = 0.0  # Exponential moving average of the per-frame rate
+    fps_text = "FPS: -"  # Overlay text, reformatted only when the report updates
+    last_frame_time = time.perf_counter()
+    display_buffer = np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)  # Reused for every drawn frame
     
     try:
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            frame = reader.read()
+            if frame is None:
                 print("✗ Failed to read frame from webcam")
                 break
             
             # Resize frame to match configuration
-            frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+            frame = resize(frame)
             
-            # Create a second frame (simulate second camera)
+            # Simulate the second camera with the same frame; the tracker detects it only once
             # In a real setup, this would be from a second camera
-            frame2 = frame.copy()
+            frame2 = frame if simulate_second_camera else None
             
             # Track objects
             tracked_objects = tracker.track_objects(frame, frame2)
             
             # Draw detections on frame
-            frame_with_detections = tracker.draw_detections(frame, tracked_objects["camera1"])
+            frame_with_detections = tracker.draw_detections(frame, tracked_objects["camera1"], out=display_buffer)
             
             # Add performance info
             frame_count += 1
+            now = time.perf_counter()
+            frame_time = now - last_frame_time
+            last_frame_time = now
+            if frame_time > 0:
+                instant_fps = 1.0 / frame_time
+                fps_ema = 0.9 * fps_ema + 0.1 * instant_fps if fps_ema else instant_fps
             if frame_count % 30 == 0:
-                elapsed_time = time.time() - start_time
-                fps = frame_count / elapsed_time
-                print(f"Frame {frame_count}: {len(tracked_objects['camera1'])} objects tracked, FPS: {fps:.1f}")
+                fps_text = f"FPS: {fps_ema:.1f}"
+                print(f"Frame {frame_count}: {len(tracked_objects['camera1'])} objects tracked, FPS: {fps_ema:.1f}")
             
             # Add FPS counter to frame
-            cv2.putText(frame_with_detections, f"FPS: {fps:.1f}", (10, 30), 
+            cv2.putText(frame_with_detections, fps_text, (10, 30), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             cv2.putText(frame_with_detections, f"Objects: {len(tracked_objects['camera1'])}", (10, 70), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
@@ -103,6 +205,7 @@ def demo_yolo_deepsort():
         print(f"✗ Error during demo: {e}")
         return False
     finally:
+        reader.stop()
         cap.release()
         cv2.destroyAllWindows()
     
@@ -137,8 +240,10 @@ def demo_with_video_file(video_path):
         print(f"✗ Failed to initialize object tracker: {e}")
         return False
     
-    # Open video file
-    cap = cv2.VideoCapture(video_path)
+    # Open video file, preferring FFMPEG which decodes without holding the GIL
+    cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        cap = cv2.VideoCapture(video_path)
     
     if not cap.isOpened():
         print(f"✗ Could not open video file: {video_path}")
@@ -148,45 +253,52 @@ def demo_with_video_file(video_path):
     
     frame_count = 0
     start_time = time.time()
+    end_of_video = False
+    quit_requested = False
+    reader = _FrameReader(cap, drop_oldest=False)
+    resize = _FrameResizer(FRAME_WIDTH, FRAME_HEIGHT)
+    display_buffer = np.empty((FRAME_HEIGHT, FRAME_WIDTH, 3), dtype=np.uint8)  # Reused for every drawn frame
     
     try:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("End of video reached")
-                break
-            
-            # Resize frame to match configuration
-            frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
-            
-            # Create a second frame (simulate second camera)
-            frame2 = frame.copy()
-            
-            # Track objects
-            tracked_objects = tracker.track_objects(frame, frame2)
-            
-            # Draw detections on frame
-            frame_with_detections = tracker.draw_detections(frame, tracked_objects["camera1"])
-            
-            # Add performance info
-            frame_count += 1
-            if frame_count % 30 == 0:
-                elapsed_time = time.time() - start_time
-                fps = frame_count / elapsed_time
-                print(f"Frame {frame_count}: {len(tracked_objects['camera1'])} objects tracked, FPS: {fps:.1f}")
-            
-            # Display frame
-            cv2.imshow('YOLOv8 + DeepSORT Video Demo', frame_with_detections)
+        while not end_of_video and not quit_requested:
+            # Read a batch of frames so YOLO processes them in one forward pass
+            frames = []
+            while len(frames) < YOLO_BATCH_SIZE:
+                frame = reader.read()
+                if frame is None:
+                    print("End of video reached")
+                    end_of_video = True
+                    break
+                
+                # Resize frame to match configuration
+                frames.append(resize(frame))
             
-            # Break on 'q' key
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                print("Quitting demo...")
-                break
+            # Detect objects for the whole batch, then track frame by frame
+            for frame, objects in zip(frames, tracker.track_frames(frames)):
+                # Draw detections on frame
+                frame_with_detections = tracker.draw_detections(frame, objects, out=display_buffer)
+                
+                # Add performance info
+                frame_count += 1
+                if frame_count % 30 == 0:
+                    elapsed_time = time.time() - start_time
+                    fps = frame_count / elapsed_time
+                    print(f"Frame {frame_count}: {len(objects)} objects tracked, FPS: {fps:.1f}")
+                
+                # Display frame
+                cv2.imshow('YOLOv8 + DeepSORT Video Demo', frame_with_detections)
+                
+                # Break on 'q' key
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    print("Quitting demo...")
+                    quit_requested = True
+                    break
                 
     except Exception as e:
         print(f"✗ Error during demo: {e}")
         return False
     finally:
+        reader.stop()
         cap.release()
         cv2.destroyAllWindows()
     
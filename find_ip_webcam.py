@@ -3,38 +3,85 @@
 Script to find IP webcam devices on the local network.
 """
 
+import asyncio
 import socket
-import threading
-import time
-import urllib.request
-import urllib.error
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def scan_port(ip, port):
-    """Scan a specific IP and port."""
+# Probes in flight at once; bounded so the scan stays under the open-file limit
+MAX_CONCURRENT_PROBES = 500
+
+async def scan_port(ip, port):
+    """Scan a specific IP and port, returning the open connection or None."""
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((ip, port))
-        sock.close()
-        return result == 0
-    except:
-        return False
+        return await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=1.0)
+    except (OSError, asyncio.TimeoutError):
+        return None
+
+def build_request(method, ip, port, extra_headers=""):
+    """Build a minimal HTTP/1.0 request for /shot.jpg."""
+    return (f"{method} /shot.jpg HTTP/1.0\r\nHost: {ip}:{port}\r\n"
+            f"User-Agent: Mozilla/5.0\r\n{extra_headers}Connection: close\r\n\r\n").encode("ascii")
 
-def test_http_endpoint(ip, port):
-    """Test if an IP has an HTTP webcam endpoint."""
-    url = f"http://{ip}:{port}/shot.jpg"
+async def read_response_head(reader, writer, request):
+    """Send a request and return the status code and lower-cased headers."""
+    writer.write(request)
+    # Only the status line and headers are needed, never the image body
+    header = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=3.0)
+    lines = header.decode("latin-1").split("\r\n")
+    status = lines[0].split()
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return (status[1] if len(status) >= 2 else ""), headers
+
+async def test_http_endpoint(ip, port, reader, writer):
+    """Test if an open connection serves an HTTP webcam endpoint."""
     try:
-        req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-        with urllib.request.urlopen(req, timeout=3) as response:
-            if response.getcode() == 200:
-                content_type = response.headers.get('Content-Type', '')
-                if 'image' in content_type.lower() or 'jpeg' in content_type.lower():
-                    return True, f"✅ Found IP webcam at {ip}:{port} (Content-Type: {content_type})"
-    except:
-        pass
+        status, headers = await read_response_head(reader, writer, build_request("HEAD", ip, port))
+        if status in ("405", "501"):
+            # Server rejects HEAD; ask for just the first byte on a fresh connection
+            streams = await scan_port(ip, port)
+            if streams is None:
+                return False, ""
+            reader, range_writer = streams
+            try:
+                status, headers = await read_response_head(
+                    reader, range_writer, build_request("GET", ip, port, "Range: bytes=0-0\r\n"))
+            finally:
+                range_writer.close()
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return False, ""
+    
+    if status not in ("200", "206"):
+        return False, ""
+    content_type = headers.get("content-type", "")
+    if 'image' in content_type.lower() or 'jpeg' in content_type.lower():
+        return True, f"✅ Found IP webcam at {ip}:{port} (Content-Type: {content_type})"
     return False, ""
 
+async def probe(ip, port, limit):
+    """Probe one IP/port, sending the HTTP check over the same TCP connection."""
+    async with limit:
+        streams = await scan_port(ip, port)
+        if streams is None:
+            return False, ""
+        reader, writer = streams
+        try:
+            return await test_http_endpoint(ip, port, reader, writer)
+        finally:
+            writer.close()
+
+async def probe_hosts(ips, ports):
+    """Probe every IP/port pair concurrently and return the webcams found."""
+    limit = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    found_devices = []
+    for next_result in asyncio.as_completed([probe(ip, port, limit) for ip in ips for port in ports]):
+        found, message = await next_result
+        if found:
+            found_devices.append(message)
+            print(message)
+    return found_devices
+
 def scan_network():
     """Scan the local network for IP webcam devices."""
     print("Scanning local network for IP webcam devices...")
@@ -58,32 +105,10 @@ def scan_network():
     # Common ports for IP webcams
     ports = [8080, 8081, 8082, 8000, 8888, 9000]
     
-    found_devices = []
-    
-    # Scan all IPs in the network
-    with ThreadPoolExecutor(max_workers=50) as executor:
-        futures = []
-        
-        for i in range(1, 255):
-            ip = f"{network_prefix}.{i}"
-            
-            # Skip our own IP
-            if ip == local_ip:
-                continue
-                
-            for port in ports:
-                futures.append(executor.submit(scan_port, ip, port))
-                futures.append(executor.submit(test_http_endpoint, ip, port))
-        
-        # Process results
-        for future in as_completed(futures):
-            try:
-                result = future.result()
-                if isinstance(result, tuple) and result[0]:  # HTTP endpoint found
-                    found_devices.append(result[1])
-                    print(result[1])
-            except Exception as e:
-                pass
+    # Scan all IPs in the network, skipping our own IP. Hosts are numeric
+    # addresses, so the event loop connects without any resolver lookups.
+    ips = [f"{network_prefix}.{i}" for i in range(1, 255) if f"{network_prefix}.{i}" != local_ip]
+    found_devices = asyncio.run(probe_hosts(ips, ports))
     
     print("\n" + "=" * 60)
     if found_devices:
@@ -3,45 +3,95 @@
 Script to find the correct port for IP webcam.
 """
 
+import errno
+import http.client
+import select
 import socket
-import urllib.request
-import urllib.error
 import time
 
-def test_port(ip, port):
-    """Test if a port is open and has webcam service."""
+# connect_ex results meaning a non-blocking connect is still under way
+_CONNECT_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+def scan_ports(ip, ports, timeout=3):
+    """
+    Connect to all ports at once and wait for them under one shared timeout.
+    
+    Returns a dict mapping each port to its connect result (0 means open).
+    """
+    pending = {}
+    results = {}
     try:
-        # Test TCP connection
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(3)
-        result = sock.connect_ex((ip, port))
-        sock.close()
+        for port in ports:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.setblocking(False)
+                result = sock.connect_ex((ip, port))
+            except Exception:
+                sock.close()
+                raise
+            if result == 0 or result in _CONNECT_IN_PROGRESS:
+                pending[sock] = port
+            else:
+                results[port] = result
+                sock.close()
         
-        if result == 0:
-            # Port is open, test HTTP endpoints
-            return test_http_endpoints(ip, port)
-        else:
-            return False, f"Port {port} closed (error: {result})"
-            
-    except Exception as e:
-        return False, f"Error testing port {port}: {e}"
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Writable means the connect finished; Windows reports failures as exceptional
+            _, writable, failed = select.select([], list(pending), list(pending), remaining)
+            for sock in set(writable) | set(failed):
+                results[pending[sock]] = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                del pending[sock]
+                sock.close()
+        
+        for port in pending.values():
+            results[port] = errno.ETIMEDOUT
+    finally:
+        # Also reached when a connect or select raises, so no socket is leaked
+        for sock in pending:
+            sock.close()
+    return results
+
+def request_headers(conn, method, endpoint, extra_headers=None):
+    """Send a request on a persistent connection and return the response without its body."""
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    if extra_headers:
+        headers.update(extra_headers)
+    conn.request(method, endpoint, headers=headers)
+    response = conn.getresponse()
+    if method == "HEAD":
+        response.read()  # Empty, but frees the connection for the next endpoint
+    else:
+        conn.close()  # Streaming endpoints may ignore Range, so never read their body
+    return response
 
 def test_http_endpoints(ip, port):
     """Test common IP webcam HTTP endpoints."""
     base_url = f"http://{ip}:{port}"
     endpoints = ["/", "/shot.jpg", "/video", "/mjpeg", "/videofeed", "/stream"]
     
-    for endpoint in endpoints:
-        url = base_url + endpoint
-        try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req, timeout=5) as response:
-                if response.getcode() == 200:
-                    content_type = response.headers.get('Content-Type', '')
-                    content_length = response.headers.get('Content-Length', 'Unknown')
+    # One keep-alive connection is shared by all endpoint checks on this port
+    conn = http.client.HTTPConnection(ip, port, timeout=5)
+    try:
+        for endpoint in endpoints:
+            url = base_url + endpoint
+            try:
+                response = request_headers(conn, "HEAD", endpoint)
+                if response.status in (405, 501):
+                    # Server rejects HEAD; ask for just the first byte instead
+                    response = request_headers(conn, "GET", endpoint, {'Range': 'bytes=0-0'})
+                if response.status in (200, 206):
+                    content_type = response.getheader('Content-Type', '')
+                    content_length = response.getheader('Content-Length', 'Unknown')
                     return True, f"✅ Found webcam at {url} (Content-Type: {content_type}, Length: {content_length})"
-        except:
-            continue
+            except (OSError, http.client.HTTPException):
+                conn.close()  # Reconnects on the next request
+                continue
+    finally:
+        conn.close()
     
     return False, f"Port {port} open but no webcam endpoints found"
 
@@ -57,9 +107,20 @@ def main():
     
     found_webcams = []
     
+    # TCP connects for every port run together; only open ports get the HTTP checks
+    try:
+        connect_results = scan_ports(target_ip, ports)
+    except OSError as e:
+        print(f"Error scanning ports: {e}")
+        return
+    
     for port in ports:
         print(f"Testing port {port}...", end=" ")
-        success, message = test_port(target_ip, port)
+        result = connect_results[port]
+        if result == 0:
+            success, message = test_http_endpoints(target_ip, port)
+        else:
+            success, message = False, f"Port {port} closed (error: {result})"
         
         if success:
             print(f"✅ {message}")
@@ -2,158 +2,162 @@
 Demo script for frame size configuration features
 """
 
+import sys
+from dataclasses import dataclass
 import cv2
 import numpy as np
 from config import *
 
+# slots=True is only available on Python 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+# Smallest window: the 800x600 canvas plus the 400px side panel and 200px of controls
+_WINDOW_MIN_WIDTH = 800 + 400
+_WINDOW_MIN_HEIGHT = 600 + 200
+
+# Per-preset output blocks, rendered once at import
+_PRESET_TEMPLATE = ("{i}. {p.name}\n"
+                    "   Frame: {p.frame_width}x{p.frame_height}\n"
+                    "   Display: {p.display_width}x{p.display_height}\n"
+                    "   Window: {p.window_width}x{p.window_height}\n"
+                    "   Description: {p.description}\n")
+_EXAMPLE_TEMPLATE = ("\n🎯 {p.use_case}:\n"
+                     "   Frame: {p.frame_width}x{p.frame_height}\n"
+                     "   Display: {p.display_width}x{p.display_height}\n"
+                     "   Reason: {p.reason}\n"
+                     "   Config: FRAME_WIDTH={p.frame_width}, FRAME_HEIGHT={p.frame_height}, "
+                     "DISPLAY_SCALE={p.display_scale}")
+
+
+@dataclass(frozen=True, **_SLOTS)
+class FramePreset:
+    """A frame size preset with its display and window sizes precomputed."""
+    name: str
+    description: str
+    use_case: str
+    reason: str
+    frame_width: int
+    frame_height: int
+    display_scale: float
+    display_width: int
+    display_height: int
+    window_width: int
+    window_height: int
+
+
+def _preset(name: str, description: str, use_case: str, reason: str,
+            frame_width: int, frame_height: int, display_scale: float) -> FramePreset:
+    """Build a preset, deriving the display and window sizes from the frame size and scale."""
+    display_width = int(frame_width * display_scale)
+    display_height = int(frame_height * display_scale)
+    return FramePreset(
+        name=name,
+        description=description,
+        use_case=use_case,
+        reason=reason,
+        frame_width=frame_width,
+        frame_height=frame_height,
+        display_scale=display_scale,
+        display_width=display_width,
+        display_height=display_height,
+        window_width=max(_WINDOW_MIN_WIDTH, display_width * 2 + 100),
+        window_height=max(_WINDOW_MIN_HEIGHT, display_height + 300)
+    )
+
+
+PRESETS = (
+    _preset('Small (Good for performance)', 'Small frames, fast processing',
+            'Performance Testing', 'Small frames for maximum speed', 320, 240, 0.5),
+    _preset('Medium (Balanced)', 'Standard size, good balance',
+            'Development/Debugging', 'Standard size, easy to work with', 640, 480, 1.0),
+    _preset('Large (High quality)', 'High quality, larger display',
+            'Quality Testing', 'High quality for detailed analysis', 1280, 720, 1.5),
+    _preset('HD (Maximum quality)', 'Maximum quality, large display',
+            'Presentation/Demo', 'Maximum quality for presentations', 1920, 1080, 2.0),
+)
+
+_PRESET_TEXT = tuple(_PRESET_TEMPLATE.format(i=i, p=p) for i, p in enumerate(PRESETS, 1))
+_EXAMPLE_TEXT = tuple(_EXAMPLE_TEMPLATE.format(p=p) for p in PRESETS)
+
+def _write_lines(lines):
+    """Write a block of output lines to stdout with a single write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 def demo_frame_size_configuration():
     """Demonstrate frame size configuration features."""
     
-    print("🎥 Frame Size Configuration Demo")
-    print("=" * 50)
-    print("This demo shows how to configure frame sizes to prevent cropping.")
-    print()
+    # Collected and written in one go rather than one print per line
+    lines = []
+    lines.append("🎥 Frame Size Configuration Demo")
+    lines.append("=" * 50)
+    lines.append("This demo shows how to configure frame sizes to prevent cropping.")
+    lines.append("")
     
     # Show current configuration
-    print("📋 Current Configuration:")
-    print(f"  Frame Width: {FRAME_WIDTH}")
-    print(f"  Frame Height: {FRAME_HEIGHT}")
-    print(f"  Display Width: {DISPLAY_WIDTH}")
-    print(f"  Display Height: {DISPLAY_HEIGHT}")
-    print(f"  Display Scale: {DISPLAY_SCALE}")
-    print()
+    lines.append("📋 Current Configuration:")
+    lines.append(f"  Frame Width: {FRAME_WIDTH}")
+    lines.append(f"  Frame Height: {FRAME_HEIGHT}")
+    lines.append(f"  Display Width: {DISPLAY_WIDTH}")
+    lines.append(f"  Display Height: {DISPLAY_HEIGHT}")
+    lines.append(f"  Display Scale: {DISPLAY_SCALE}")
+    lines.append("")
     
     # Show different configuration options
-    print("⚙️ Configuration Options:")
-    print()
-    
-    configurations = [
-        {
-            'name': 'Small (Good for performance)',
-            'frame_width': 320,
-            'frame_height': 240,
-            'display_scale': 0.5,
-            'description': 'Small frames, fast processing'
-        },
-        {
-            'name': 'Medium (Balanced)',
-            'frame_width': 640,
-            'frame_height': 480,
-            'display_scale': 1.0,
-            'description': 'Standard size, good balance'
-        },
-        {
-            'name': 'Large (High quality)',
-            'frame_width': 1280,
-            'frame_height': 720,
-            'display_scale': 1.5,
-            'description': 'High quality, larger display'
-        },
-        {
-            'name': 'HD (Maximum quality)',
-            'frame_width': 1920,
-            'frame_height': 1080,
-            'display_scale': 2.0,
-            'description': 'Maximum quality, large display'
-        }
-    ]
+    lines.append("⚙️ Configuration Options:")
+    lines.append("")
     
-    for i, config in enumerate(configurations, 1):
-        display_width = int(config['frame_width'] * config['display_scale'])
-        display_height = int(config['frame_height'] * config['display_scale'])
-        window_width = max(800 + 400, display_width * 2 + 100)
-        window_height = max(600 + 200, display_height + 300)
-        
-        print(f"{i}. {config['name']}")
-        print(f"   Frame: {config['frame_width']}x{config['frame_height']}")
-        print(f"   Display: {display_width}x{display_height}")
-        print(f"   Window: {window_width}x{window_height}")
-        print(f"   Description: {config['description']}")
-        print()
+    lines.extend(_PRESET_TEXT)
     
-    print("🔧 How to Change Frame Sizes:")
-    print()
-    print("Method 1: Edit config.py")
-    print("  FRAME_WIDTH = 640")
-    print("  FRAME_HEIGHT = 480")
-    print("  DISPLAY_SCALE = 1.0")
-    print()
-    print("Method 2: Use GUI Settings")
-    print("  Settings → Frame Size Settings")
-    print("  Choose from presets or enter custom values")
-    print()
-    print("Method 3: Runtime Configuration")
-    print("  The GUI allows changing display scale without restarting")
-    print()
+    lines.append("🔧 How to Change Frame Sizes:")
+    lines.append("")
+    lines.append("Method 1: Edit config.py")
+    lines.append("  FRAME_WIDTH = 640")
+    lines.append("  FRAME_HEIGHT = 480")
+    lines.append("  DISPLAY_SCALE = 1.0")
+    lines.append("")
+    lines.append("Method 2: Use GUI Settings")
+    lines.append("  Settings → Frame Size Settings")
+    lines.append("  Choose from presets or enter custom values")
+    lines.append("")
+    lines.append("Method 3: Runtime Configuration")
+    lines.append("  The GUI allows changing display scale without restarting")
+    lines.append("")
     
-    print("💡 Tips to Prevent Cropping:")
-    print("1. Set DISPLAY_SCALE to 1.0 or higher")
-    print("2. Ensure window size accommodates frame size")
-    print("3. Use the GUI settings to preview changes")
-    print("4. Test with your specific camera setup")
-    print()
+    lines.append("💡 Tips to Prevent Cropping:")
+    lines.append("1. Set DISPLAY_SCALE to 1.0 or higher")
+    lines.append("2. Ensure window size accommodates frame size")
+    lines.append("3. Use the GUI settings to preview changes")
+    lines.append("4. Test with your specific camera setup")
+    lines.append("")
     
-    print("🚀 Quick Start:")
-    print("1. Run the main application: python main.py")
-    print("2. Go to Settings → Frame Size Settings")
-    print("3. Choose a preset or enter custom values")
-    print("4. Click 'Apply Settings'")
-    print("5. The window will resize automatically")
-    print()
+    lines.append("🚀 Quick Start:")
+    lines.append("1. Run the main application: python main.py")
+    lines.append("2. Go to Settings → Frame Size Settings")
+    lines.append("3. Choose a preset or enter custom values")
+    lines.append("4. Click 'Apply Settings'")
+    lines.append("5. The window will resize automatically")
+    lines.append("")
     
-    print("✅ Benefits of the New System:")
-    print("- Configurable frame sizes")
-    print("- Automatic window sizing")
-    print("- Real-time display scale adjustment")
-    print("- Preset configurations")
-    print("- No more cropped frames!")
+    lines.append("✅ Benefits of the New System:")
+    lines.append("- Configurable frame sizes")
+    lines.append("- Automatic window sizing")
+    lines.append("- Real-time display scale adjustment")
+    lines.append("- Preset configurations")
+    lines.append("- No more cropped frames!")
+    _write_lines(lines)
 
 def show_configuration_examples():
     """Show example configurations for different use cases."""
     
-    print("\n📝 Configuration Examples for Different Use Cases:")
-    print("=" * 60)
+    lines = []
+    lines.append("\n📝 Configuration Examples for Different Use Cases:")
+    lines.append("=" * 60)
     
-    examples = [
-        {
-            'use_case': 'Performance Testing',
-            'frame_width': 320,
-            'frame_height': 240,
-            'display_scale': 0.5,
-            'reason': 'Small frames for maximum speed'
-        },
-        {
-            'use_case': 'Development/Debugging',
-            'frame_width': 640,
-            'frame_height': 480,
-            'display_scale': 1.0,
-            'reason': 'Standard size, easy to work with'
-        },
-        {
-            'use_case': 'Quality Testing',
-            'frame_width': 1280,
-            'frame_height': 720,
-            'display_scale': 1.5,
-            'reason': 'High quality for detailed analysis'
-        },
-        {
-            'use_case': 'Presentation/Demo',
-            'frame_width': 1920,
-            'frame_height': 1080,
-            'display_scale': 2.0,
-            'reason': 'Maximum quality for presentations'
-        }
-    ]
+    lines.extend(_EXAMPLE_TEXT)
     
-    for example in examples:
-        display_width = int(example['frame_width'] * example['display_scale'])
-        display_height = int(example['frame_height'] * example['display_scale'])
-        
-        print(f"\n🎯 {example['use_case']}:")
-        print(f"   Frame: {example['frame_width']}x{example['frame_height']}")
-        print(f"   Display: {display_width}x{display_height}")
-        print(f"   Reason: {example['reason']}")
-        print(f"   Config: FRAME_WIDTH={example['frame_width']}, FRAME_HEIGHT={example['frame_height']}, DISPLAY_SCALE={example['display_scale']}")
+    _write_lines(lines)
 
 if __name__ == "__main__":
     demo_frame_size_configuration()
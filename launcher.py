@@ -8,14 +8,14 @@ The main application should be started separately by running main.py.
 import sys
 import os
 import logging
+import subprocess
+from logging_setup import setup_logging
+
+# Configure logging before importing modules that configure it at import time
+setup_logging()
+
 from camera_config_ui import CameraConfigUI
-from config import *
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
@@ -42,6 +42,12 @@ def main():
     return True
 
 
+def run_demo(args):
+    """Run the camera configuration demo with docstrings and asserts stripped."""
+    demo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "camera_config_demo.py")
+    return subprocess.call([sys.executable, "-OO", demo_path, *args]) == 0
+
+
 if __name__ == "__main__":
     # Check command line arguments
     success = True  # Default success value
@@ -53,13 +59,17 @@ if __name__ == "__main__":
             print("Usage:")
             print("  python launcher.py          # Start camera configuration")
             print("  python launcher.py --help   # Show this help")
+            print("  python launcher.py --demo   # Run the configuration demo")
             print()
             print("After configuration, start the main application with:")
             print("  python main.py")
             print()
             print("Options:")
             print("  --help   Show this help message")
+            print("  --demo   Run camera_config_demo.py (extra arguments are passed through)")
             success = True  # Help command is always successful
+        elif sys.argv[1] == "--demo":
+            success = run_demo(sys.argv[2:])
         else:
             print(f"❌ Unknown argument: {sys.argv[1]}")
             print("Use --help for usage information")
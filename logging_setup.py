@@ -0,0 +1,39 @@
+"""
+Logging Setup Module
+
+Configures application logging once per process for the entry-point scripts.
+"""
+
+import sys
+import logging
+from logging.handlers import RotatingFileHandler
+from config import LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def setup_logging(log_file: str = LOG_FILE):
+    """
+    Configure the root logger with a rotating log file and stdout output.
+    
+    Safe to call more than once; handlers are only added the first time.
+    Call it before importing modules that set up logging at import time.
+    
+    Args:
+        log_file: Path of the log file, or None to log to stdout only
+    """
+    root = logging.getLogger()
+    if getattr(root, '_smcmd_configured', False):
+        return
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES,
+                                            backupCount=LOG_BACKUP_COUNT, encoding='utf-8', delay=True))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    
+    root.setLevel(getattr(logging, LOG_LEVEL))
+    root._smcmd_configured = True
@@ -6,28 +6,25 @@ Multi-Camera Object Tracking System
 
 import sys
 import os
+import argparse
+import functools
+import importlib
+import json
 import logging
 import signal
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from camera_manager import CameraManager
-from object_tracker import ObjectTracker
-from visualizer import Visualizer
-from config import *
+import config
+
+from logging_setup import setup_logging
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('multi_camera_tracking.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -62,6 +59,11 @@ class MultiCameraTrackingApp:
         try:
             logger.info("Initializing application components...")
             
+            # Imported here so --help and failed dependency checks don't pay for cv2/torch/tkinter
+            from camera_manager import CameraManager
+            from object_tracker import ObjectTracker
+            from visualizer import Visualizer
+            
             # Initialize camera manager
             self.camera_manager = CameraManager()
             if not self.camera_manager.initialize_cameras():
@@ -139,42 +141,132 @@ class MultiCameraTrackingApp:
             self.stop()
 
 
+# Startup camera check results, reused across launches for CAMERA_CHECK_CACHE_TTL seconds
+CAMERA_CHECK_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "smcmd", "camera_check.json")
+
+
+def _try_import(module_name: str) -> Optional[ImportError]:
+    """Import a module, returning the ImportError instead of raising it."""
+    try:
+        importlib.import_module(module_name)
+        return None
+    except ImportError as e:
+        return e
+
+
+@functools.lru_cache(maxsize=1)
 def check_dependencies():
     """Check if all required dependencies are available."""
-    try:
-        import cv2
-        import numpy
-        import PIL
-        import tkinter
+    modules = ["cv2", "numpy", "PIL", "tkinter"]
+    
+    # Extension loading releases the GIL, so the imports overlap instead of adding up
+    with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+        errors = [e for e in executor.map(_try_import, modules) if e is not None]
+    
+    if not errors:
         logger.info("All dependencies are available")
         return True
-    except ImportError as e:
+    
+    # The root logger already writes to stdout, so these aren't printed separately
+    for e in errors:
         logger.error(f"Missing dependency: {e}")
-        print(f"Error: Missing dependency - {e}")
-        print("Please install all dependencies using: pip install -r requirements.txt")
-        return False
+    logger.error("Please install all dependencies using: pip install -r requirements.txt")
+    return False
+
 
+def _camera_check_key() -> dict:
+    """Describe what the cached camera check depends on."""
+    import cv2
+    return {
+        "python": sys.version,
+        "opencv": cv2.__version__,
+        "indices": [config.CAMERA_1_INDEX, config.CAMERA_2_INDEX]
+    }
 
-def check_cameras():
-    """Check camera availability."""
+
+def _load_camera_check() -> Optional[dict]:
+    """Return cached camera availability if it is recent and for the same environment."""
     try:
-        import cv2
+        if time.time() - os.path.getmtime(CAMERA_CHECK_CACHE_FILE) > config.CAMERA_CHECK_CACHE_TTL:
+            return None
+        with open(CAMERA_CHECK_CACHE_FILE, 'r') as f:
+            cached = json.load(f)
+        if cached.get("key") != _camera_check_key():
+            return None
+        return cached.get("available")
+    except (OSError, ValueError):
+        return None
+
+
+def _save_camera_check(available: dict):
+    """Persist camera availability for later launches."""
+    try:
+        os.makedirs(os.path.dirname(CAMERA_CHECK_CACHE_FILE), exist_ok=True)
+        with open(CAMERA_CHECK_CACHE_FILE, 'w') as f:
+            json.dump({"key": _camera_check_key(), "available": available}, f)
+    except OSError as e:
+        logger.debug(f"Could not save camera check cache: {e}")
+
+
+def _probe_camera(index: int) -> bool:
+    """Open one camera with the native backend and check that it delivers a frame."""
+    import cv2
+    
+    # The native backend skips OpenCV's slow backend auto-selection
+    if sys.platform.startswith('win'):
+        backend = cv2.CAP_DSHOW
+    elif sys.platform.startswith('linux'):
+        backend = cv2.CAP_V4L2
+    else:
+        backend = cv2.CAP_ANY
+    
+    cap = cv2.VideoCapture(index, backend)
+    try:
+        if not cap.isOpened():
+            return False
+        # grab() proves frames arrive without paying for a decode
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not cap.grab():
+            logger.warning(f"Camera index {index} opens but grab() failed")
+            return False
+        return True
+    finally:
+        cap.release()
+
+
+def check_cameras(use_cache: bool = True, save: bool = True):
+    """
+    Check camera availability.
+    
+    Args:
+        use_cache: Reuse a recent result from a previous launch instead of opening the cameras
+        save: Store a freshly probed result for later launches
         
-        # Test camera 1
-        cap1 = cv2.VideoCapture(CAMERA_1_INDEX)
-        if cap1.isOpened():
-            logger.info(f"Camera 1 (index {CAMERA_1_INDEX}) is available")
-            cap1.release()
+    Returns:
+        bool: True if the check completed
+    """
+    try:
+        cameras = [("Camera 1", config.CAMERA_1_INDEX), ("Camera 2", config.CAMERA_2_INDEX)]
+        available = _load_camera_check() if use_cache else None
+        cached = available is not None
+        if cached:
+            logger.info("Using cached camera check results")
         else:
-            logger.warning(f"Camera 1 (index {CAMERA_1_INDEX}) is not available")
+            # Device opens block on the driver, so probe both cameras at once
+            # Both cameras may use the same device; opening it twice at once would report busy
+            indices = list(dict.fromkeys(index for _, index in cameras))
+            with ThreadPoolExecutor(max_workers=len(indices)) as executor:
+                available = {str(index): ok for index, ok in zip(indices, executor.map(_probe_camera, indices))}
+            if save:
+                _save_camera_check(available)
         
-        # Test camera 2
-        cap2 = cv2.VideoCapture(CAMERA_2_INDEX)
-        if cap2.isOpened():
-            logger.info(f"Camera 2 (index {CAMERA_2_INDEX}) is available")
-            cap2.release()
-        else:
-            logger.warning(f"Camera 2 (index {CAMERA_2_INDEX}) is not available")
+        # A cached result may be stale, so say where it came from
+        source = " (cached; run with --refresh-cache to re-probe)" if cached else ""
+        for name, index in cameras:
+            if available.get(str(index)):
+                logger.info(f"{name} (index {index}) is available{source}")
+            else:
+                logger.warning(f"{name} (index {index}) is not available{source}")
         
         return True
         
@@ -185,6 +277,13 @@ def check_cameras():
 
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="Multi-Camera Object Tracking System")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="probe cameras without reading or writing the startup check cache")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="probe cameras again and update the startup check cache")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Multi-Camera Object Tracking System")
     print("=" * 60)
@@ -195,7 +294,10 @@ def main():
     
     # Check cameras
     print("\nChecking camera availability...")
-    check_cameras()
+    if args.no_cache:
+        check_cameras(use_cache=False, save=False)
+    else:
+        check_cameras(use_cache=not args.refresh_cache)
     
     # Create and run application
     app = MultiCameraTrackingApp()
@@ -5,16 +5,79 @@ Handles object detection using YOLOv8 and tracking using DeepSORT.
 """
 
 import cv2
+import functools
 import numpy as np
+import os
 import time
 from typing import List, Tuple, Optional, Dict
 import logging
+import torch
 from ultralytics import YOLO
 from deep_sort_realtime.deepsort_tracker import DeepSort
 from config import *
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+# Network stride; fused tensors skip letterboxing so frame sides must be multiples of it
+_YOLO_STRIDE = 32
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _preprocess_fused(src, dst):
+        """Convert a BGR uint8 HWC frame into a normalized RGB CHW float32 tensor in one pass."""
+        height, width = src.shape[0], src.shape[1]
+        scale = np.float32(1.0 / 255.0)
+        for y in prange(height):
+            for x in range(width):
+                dst[0, y, x] = src[y, x, 2] * scale
+                dst[1, y, x] = src[y, x, 1] * scale
+                dst[2, y, x] = src[y, x, 0] * scale
+else:
+    _preprocess_fused = None
+
+
+@functools.lru_cache(maxsize=None)
+def get_yolo(model: str = YOLO_MODEL) -> YOLO:
+    """
+    Load a YOLO model once and reuse it for later callers.
+    
+    Each distinct model is kept, so loading the .pt weights never evicts the
+    TensorRT engine the tracker is using.
+    
+    Args:
+        model: Model weights path or name
+        
+    Returns:
+        The shared YOLO model instance
+    """
+    return YOLO(model)
+
+
+def export_yolo_engine(model: str = YOLO_MODEL) -> Optional[str]:
+    """
+    Export a YOLO model to a TensorRT FP16 engine sized for the tracker.
+    
+    The engine is built with a dynamic batch of up to YOLO_BATCH_SIZE so the
+    same file serves single frames, camera pairs and offline batches.
+    
+    Args:
+        model: Model weights path or name to export
+        
+    Returns:
+        Path of the exported engine, or None if the export failed
+    """
+    try:
+        return YOLO(model).export(format='engine', half=True, imgsz=(FRAME_HEIGHT, FRAME_WIDTH),
+                                  batch=YOLO_BATCH_SIZE, dynamic=True)
+    except Exception as e:
+        logger.error(f"Failed to export TensorRT engine: {e}")
+        return None
+
 
 class DetectedObject:
     """Represents a detected object with tracking information."""
@@ -58,6 +121,8 @@ class ObjectTracker:
         self.tracked_objects = {}
         self.object_history = {}
         self.last_detection_time = {}
+        self._input_buffer = None  # Reused NCHW batch for the fused preprocessing path
+        self._copy_done = None  # CUDA event recorded after the last upload from _input_buffer
         
         # Initialize YOLOv8 detector
         self._initialize_yolo_detector()
@@ -68,14 +133,20 @@ class ObjectTracker:
     def _initialize_yolo_detector(self):
         """Initialize the YOLOv8 object detection system."""
         try:
-            # Load YOLOv8 model (will download automatically if not present)
-            self.yolo_model = YOLO(YOLO_MODEL)
+            # Prefer the TensorRT engine; the .pt model downloads automatically if not present
+            if os.path.exists(YOLO_ENGINE):
+                model_path = YOLO_ENGINE
+            else:
+                model_path = YOLO_MODEL
+                logger.warning(f"TensorRT engine {YOLO_ENGINE} not found, using {YOLO_MODEL} "
+                               f"(build it with object_tracker.export_yolo_engine())")
+            self.yolo_model = get_yolo(model_path)
             
             # Set detection parameters
             self.conf_threshold = YOLO_CONF_THRESHOLD
             self.iou_threshold = YOLO_IOU_THRESHOLD
             
-            logger.info(f"YOLOv8 detector initialized successfully with model: {YOLO_MODEL}")
+            logger.info(f"YOLOv8 detector initialized successfully with model: {model_path}")
             
         except Exception as e:
             logger.error(f"Failed to initialize YOLOv8 detector: {e}")
@@ -102,6 +173,7 @@ class ObjectTracker:
                     polygon=False,
                     today=None
                 ),
+                # Camera 2 gets its appearance features from camera 1's embedder (see _generate_embeds)
                 'camera2': DeepSort(
                     max_age=DEEPSORT_MAX_AGE,
                     n_init=DEEPSORT_N_INIT,
@@ -109,7 +181,7 @@ class ObjectTracker:
                     max_cosine_distance=DEEPSORT_MAX_COSINE_DISTANCE,
                     nn_budget=None,
                     override_track_class=None,
-                    embedder=DEEPSORT_EMBEDDER,
+                    embedder=None,
                     half=DEEPSORT_HALF,
                     bgr=DEEPSORT_BGR,
                     embedder_gpu=DEEPSORT_EMBEDDER_GPU,
@@ -137,65 +209,131 @@ class ObjectTracker:
         Returns:
             List of detected objects
         """
+        return self.detect_objects_batch([frame], [camera_id])[0]
+    
+    def detect_objects_batch(self, frames: List[np.ndarray], camera_ids: List[str]) -> List[List[DetectedObject]]:
+        """
+        Detect objects in several frames with a single batched YOLOv8 call.
+        
+        Args:
+            frames: Input frames
+            camera_ids: ID of the camera each frame came from
+            
+        Returns:
+            List of detected objects for each frame, in input order
+        """
         if self.yolo_model is None:
             logger.warning("YOLO model is None, cannot detect objects")
+            return [[] for _ in frames]
+        if not frames:
             return []
         
         try:
-            # Run YOLOv8 detection
-            logger.debug(f"Running YOLOv8 detection on {camera_id} frame with shape {frame.shape}")
-            results = self.yolo_model(frame, conf=self.conf_threshold, iou=self.iou_threshold, verbose=False)
-            
-            detected_objects = []
-            total_detections = 0
-            filtered_by_class = 0
-            filtered_by_size = 0
-            
-            # Process detection results
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    total_detections += len(boxes)
-                    for box in boxes:
-                        # Get bounding box coordinates
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        x, y, w, h = int(x1), int(y1), int(x2 - x1), int(y2 - y1)
-                        
-                        # Get confidence and class
-                        confidence = float(box.conf[0].cpu().numpy())
-                        class_id = int(box.cls[0].cpu().numpy())
-                        class_name = self.yolo_model.names[class_id]
-                        
-                        logger.debug(f"Raw detection: {class_name} (conf: {confidence:.2f}) at ({x}, {y}, {w}, {h})")
-                        
-                        # Filter by class
-                        if class_name in TRACK_CLASSES:
-                            # Filter by size
-                            area = w * h
-                            if MIN_OBJECT_SIZE <= area <= MAX_OBJECT_SIZE:
-                                obj = DetectedObject((x, y, w, h), confidence, class_id, class_name, camera_id)
-                                detected_objects.append(obj)
-                                logger.debug(f"Accepted detection: {class_name} (conf: {confidence:.2f}) area: {area}")
-                            else:
-                                filtered_by_size += 1
-                                logger.debug(f"Filtered by size: {class_name} area {area} not in range [{MIN_OBJECT_SIZE}, {MAX_OBJECT_SIZE}]")
-                        else:
-                            filtered_by_class += 1
-                            logger.debug(f"Filtered by class: {class_name} not in {TRACK_CLASSES}")
-            
-            # Log detection summary
-            if total_detections > 0:
-                logger.info(f"{camera_id}: YOLO detected {total_detections} objects, "
-                          f"filtered {filtered_by_class} by class, {filtered_by_size} by size, "
-                          f"accepted {len(detected_objects)}")
-            else:
-                logger.debug(f"{camera_id}: YOLO detected 0 objects")
-            
-            return detected_objects
+            # Run YOLOv8 detection on the whole batch in one forward pass
+            logger.debug(f"Running YOLOv8 detection on {len(frames)} frame(s) with shape {frames[0].shape}")
+            results = self.yolo_model(self._prepare_batch(frames), conf=self.conf_threshold,
+                                      iou=self.iou_threshold, verbose=False)
+            return [self._parse_detections(result, camera_id) for result, camera_id in zip(results, camera_ids)]
             
         except Exception as e:
-            logger.error(f"Error in YOLOv8 object detection for {camera_id}: {e}")
-            return []
+            logger.error(f"Error in YOLOv8 object detection for {', '.join(camera_ids)}: {e}")
+            return [[] for _ in frames]
+    
+    def _prepare_batch(self, frames: List[np.ndarray]):
+        """
+        Build the YOLO input for a batch of frames.
+        
+        Same-size frames whose sides are multiples of the network stride are
+        converted with the fused Numba kernel into a reused NCHW buffer, which
+        YOLO consumes without its own resize/colour/normalize passes. With CUDA
+        the buffer is pinned and sent to the GPU in one non-blocking copy.
+        
+        Args:
+            frames: BGR frames to detect on
+            
+        Returns:
+            A float tensor batch, or the frames unchanged when the fused path can't be used
+        """
+        if _preprocess_fused is None or not YOLO_FUSED_PREPROCESS:
+            return frames
+        
+        shape = frames[0].shape
+        if len(shape) != 3 or shape[2] != 3 or shape[0] % _YOLO_STRIDE or shape[1] % _YOLO_STRIDE:
+            return frames
+        if any(frame.shape != shape or frame.dtype != np.uint8 for frame in frames):
+            return frames
+        
+        buffer = self._input_buffer
+        if buffer is None or buffer.shape[0] < len(frames) or tuple(buffer.shape[2:]) != shape[:2]:
+            # Page-locked memory lets the host-to-device copy run asynchronously. It is
+            # expensive to allocate, so size it for a full batch and slice smaller ones
+            batch_shape = (max(len(frames), YOLO_BATCH_SIZE), 3, shape[0], shape[1])
+            buffer = self._input_buffer = torch.empty(batch_shape, dtype=torch.float32,
+                                                      pin_memory=torch.cuda.is_available())
+            self._copy_done = None
+        elif self._copy_done is not None:
+            # Don't refill the buffer while the previous upload may still be reading it
+            self._copy_done.synchronize()
+        
+        batch = buffer[:len(frames)]
+        for frame, dst in zip(frames, batch.numpy()):
+            _preprocess_fused(frame, dst)
+        if batch.is_pinned():
+            batch = batch.to('cuda', non_blocking=True)
+            self._copy_done = torch.cuda.Event()
+            self._copy_done.record()
+        return batch
+    
+    def _parse_detections(self, result, camera_id: str) -> List[DetectedObject]:
+        """Convert one YOLOv8 result into filtered DetectedObjects."""
+        detected_objects = []
+        total_detections = 0
+        filtered_by_class = 0
+        filtered_by_size = 0
+        
+        # Process detection results
+        boxes = result.boxes
+        if boxes is not None:
+            total_detections += len(boxes)
+            # Copy coordinates, confidences and classes to the host once per result
+            xyxy = boxes.xyxy.cpu().numpy()
+            confidences = boxes.conf.cpu().numpy()
+            class_ids = boxes.cls.cpu().numpy().astype(int)
+            for (x1, y1, x2, y2), confidence, class_id in zip(xyxy, confidences, class_ids):
+                # Get bounding box coordinates
+                x, y, w, h = int(x1), int(y1), int(x2 - x1), int(y2 - y1)
+                
+                # Get confidence and class
+                confidence = float(confidence)
+                class_id = int(class_id)
+                class_name = self.yolo_model.names[class_id]
+                
+                logger.debug(f"Raw detection: {class_name} (conf: {confidence:.2f}) at ({x}, {y}, {w}, {h})")
+                
+                # Filter by class
+                if class_name in TRACK_CLASSES:
+                    # Filter by size
+                    area = w * h
+                    if MIN_OBJECT_SIZE <= area <= MAX_OBJECT_SIZE:
+                        obj = DetectedObject((x, y, w, h), confidence, class_id, class_name, camera_id)
+                        detected_objects.append(obj)
+                        logger.debug(f"Accepted detection: {class_name} (conf: {confidence:.2f}) area: {area}")
+                    else:
+                        filtered_by_size += 1
+                        logger.debug(f"Filtered by size: {class_name} area {area} not in range [{MIN_OBJECT_SIZE}, {MAX_OBJECT_SIZE}]")
+                else:
+                    filtered_by_class += 1
+                    logger.debug(f"Filtered by class: {class_name} not in {TRACK_CLASSES}")
+        
+        # Log detection summary
+        if total_detections > 0:
+            logger.info(f"{camera_id}: YOLO detected {total_detections} objects, "
+                      f"filtered {filtered_by_class} by class, {filtered_by_size} by size, "
+                      f"accepted {len(detected_objects)}")
+        else:
+            logger.debug(f"{camera_id}: YOLO detected 0 objects")
+        
+        return detected_objects
     
     def track_objects(self, frame1: np.ndarray, frame2: np.ndarray) -> Dict[str, List[DetectedObject]]:
         """
@@ -203,7 +341,7 @@ class ObjectTracker:
         
         Args:
             frame1: Frame from camera 1 (can be None)
-            frame2: Frame from camera 2 (can be None)
+            frame2: Frame from camera 2 (can be None, or frame1 itself to mirror camera 1)
             
         Returns:
             Dictionary with tracked objects for each camera
@@ -211,15 +349,35 @@ class ObjectTracker:
         tracked_objects1 = []
         tracked_objects2 = []
         
-        # Detect objects in frame1 if available
+        # Detect objects in both cameras' frames with one batched YOLOv8 call
+        frames = []
+        camera_ids = []
+        if frame1 is not None:
+            frames.append(frame1)
+            camera_ids.append("camera1")
+        if frame2 is not None and frame2 is not frame1:
+            frames.append(frame2)
+            camera_ids.append("camera2")
+        detections = dict(zip(camera_ids, self.detect_objects_batch(frames, camera_ids)))
+        
+        # Track objects in frame1 if available
+        objects2 = detections.get("camera2")
         if frame1 is not None:
-            objects1 = self.detect_objects(frame1, "camera1")
-            tracked_objects1 = self._update_deepsort_tracking(frame1, objects1, "camera1")
+            objects1 = detections["camera1"]
+            embeds1 = None
+            if frame2 is frame1:
+                # Same image for both cameras (simulated second camera): reuse camera 1's detections
+                # as separate objects, since tracking refines bboxes and assigns IDs in place
+                objects2 = [DetectedObject(obj.bbox, obj.confidence, obj.class_id, obj.class_name, "camera2")
+                            for obj in objects1]
+                # Identical crops give identical appearance features, so embed them once for both trackers
+                embeds1 = self._generate_embeds(frame1, self._to_deepsort_detections(objects1))
+            tracked_objects1 = self._update_deepsort_tracking(frame1, objects1, "camera1", embeds1)
         
-        # Detect objects in frame2 if available
+        # Track objects in frame2 if available
         if frame2 is not None:
-            objects2 = self.detect_objects(frame2, "camera2")
-            tracked_objects2 = self._update_deepsort_tracking(frame2, objects2, "camera2")
+            embeds2 = embeds1 if frame2 is frame1 else None
+            tracked_objects2 = self._update_deepsort_tracking(frame2, objects2, "camera2", embeds2)
         
         # Calculate 3D positions for tracked objects (only if both cameras have objects)
         if tracked_objects1 and tracked_objects2:
@@ -230,7 +388,48 @@ class ObjectTracker:
             "camera2": tracked_objects2
         }
     
-    def _update_deepsort_tracking(self, frame: np.ndarray, detected_objects: List[DetectedObject], camera_id: str) -> List[DetectedObject]:
+    def track_frames(self, frames: List[np.ndarray], camera_id: str = "camera1") -> List[List[DetectedObject]]:
+        """
+        Track objects through consecutive frames of one camera.
+        
+        Detection runs as one batched YOLOv8 call; DeepSORT then updates frame by frame.
+        
+        Args:
+            frames: Consecutive frames from the camera, oldest first
+            camera_id: ID of the camera
+            
+        Returns:
+            List of tracked objects for each frame
+        """
+        detections = self.detect_objects_batch(frames, [camera_id] * len(frames))
+        return [self._update_deepsort_tracking(frame, objects, camera_id)
+                for frame, objects in zip(frames, detections)]
+    
+    def _trackable_objects(self, detected_objects: List[DetectedObject]) -> List[DetectedObject]:
+        """Drop degenerate boxes, which DeepSORT would otherwise drop itself and misalign its inputs."""
+        return [obj for obj in detected_objects if obj.bbox[2] > 0 and obj.bbox[3] > 0]
+    
+    def _to_deepsort_detections(self, detected_objects: List[DetectedObject]) -> List[Tuple[List[int], float, str]]:
+        """Convert detected objects to DeepSORT's ([left, top, w, h], confidence, class) format."""
+        return [(list(obj.bbox), obj.confidence, obj.class_name) for obj in self._trackable_objects(detected_objects)]
+    
+    def _generate_embeds(self, frame: np.ndarray, detections: List[Tuple[List[int], float, str]]) -> List[np.ndarray]:
+        """
+        Compute appearance features with the embedder shared by both camera trackers.
+        
+        Args:
+            frame: Frame the detections were made on
+            detections: Detections in DeepSORT format
+            
+        Returns:
+            One embedding per detection
+        """
+        if not detections:
+            return []
+        return self.trackers['camera1'].generate_embeds(frame, detections)
+    
+    def _update_deepsort_tracking(self, frame: np.ndarray, detected_objects: List[DetectedObject], camera_id: str,
+                                  embeds: Optional[List[np.ndarray]] = None) -> List[DetectedObject]:
         """
         Update object tracking using DeepSORT for a specific camera.
         
@@ -238,6 +437,7 @@ class ObjectTracker:
             frame: Input frame
             detected_objects: List of detected objects
             camera_id: ID of the camera
+            embeds: Precomputed embeddings for detected_objects, computed here if None
             
         Returns:
             List of tracked objects with track IDs
@@ -247,13 +447,13 @@ class ObjectTracker:
         
         try:
             # Convert detected objects to DeepSORT format
-            detections = []
-            for obj in detected_objects:
-                x, y, w, h = obj.bbox
-                detections.append(([x, y, w, h], obj.confidence, obj.class_name))
+            sources = self._trackable_objects(detected_objects)
+            detections = self._to_deepsort_detections(sources)
+            if embeds is None:
+                embeds = self._generate_embeds(frame, detections)
             
-            # Update DeepSORT tracker
-            tracks = self.trackers[camera_id].update_tracks(detections, frame=frame)
+            # Update DeepSORT tracker; each detection carries its DetectedObject through as 'others'
+            tracks = self.trackers[camera_id].update_tracks(detections, embeds=embeds, frame=frame, others=sources)
             
             # Convert tracks back to DetectedObject format
             tracked_objects = []
@@ -266,15 +466,8 @@ class ObjectTracker:
                 bbox = track.to_tlbr()  # top left bottom right
                 x, y, w, h = int(bbox[0]), int(bbox[1]), int(bbox[2] - bbox[0]), int(bbox[3] - bbox[1])
                 
-                # Find corresponding detected object
-                best_obj = None
-                best_iou = 0
-                
-                for obj in detected_objects:
-                    iou = self._calculate_iou(obj.bbox, (x, y, w, h))
-                    if iou > best_iou:
-                        best_iou = iou
-                        best_obj = obj
+                # The detection matched to this track in this frame (None if the track is coasting)
+                best_obj = track.get_det_supplementary()
                 
                 if best_obj is not None:
                     # Update the detected object with track ID
@@ -297,67 +490,40 @@ class ObjectTracker:
             logger.error(f"Error in DeepSORT tracking for {camera_id}: {e}")
             return detected_objects
     
-    def _calculate_iou(self, bbox1: Tuple[int, int, int, int], bbox2: Tuple[int, int, int, int]) -> float:
-        """
-        Calculate Intersection over Union (IoU) between two bounding boxes.
-        
-        Args:
-            bbox1: First bounding box (x, y, w, h)
-            bbox2: Second bounding box (x, y, w, h)
-            
-        Returns:
-            IoU value
-        """
-        x1, y1, w1, h1 = bbox1
-        x2, y2, w2, h2 = bbox2
-        
-        # Calculate intersection
-        x_left = max(x1, x2)
-        y_top = max(y1, y2)
-        x_right = min(x1 + w1, x2 + w2)
-        y_bottom = min(y1 + h1, y2 + h2)
-        
-        if x_right < x_left or y_bottom < y_top:
-            return 0.0
-        
-        intersection = (x_right - x_left) * (y_bottom - y_top)
-        
-        # Calculate union
-        area1 = w1 * h1
-        area2 = w2 * h2
-        union = area1 + area2 - intersection
-        
-        return intersection / union if union > 0 else 0.0
-    
     def _calculate_3d_positions(self, objects1: List[DetectedObject], objects2: List[DetectedObject]):
         """Calculate 3D positions of tracked objects using stereo vision."""
         # Calculate 3D positions for each object from each camera independently
         # Each recognized object is treated as a separate object regardless of similarity
         
+        # Match every camera 1 object against every camera 2 object at once.
+        # Similarity is based on vertical position (assuming cameras are at same height)
+        # and only counts between objects of the same class.
+        best_indices = np.zeros(len(objects1), dtype=np.intp)
+        best_similarities = np.zeros(len(objects1))
+        if objects1 and objects2:
+            centers1 = np.array([obj.get_center() for obj in objects1], dtype=np.float64)
+            centers2 = np.array([obj.get_center() for obj in objects2], dtype=np.float64)
+            y_diff = np.abs(centers1[:, 1:2] - centers2[None, :, 1])
+            similarity = 1.0 / (1.0 + y_diff / FRAME_HEIGHT)  # Normalize by frame height
+            same_class = (np.array([obj.class_name for obj in objects1], dtype=object)[:, None]
+                          == np.array([obj.class_name for obj in objects2], dtype=object)[None, :])
+            similarity[~same_class] = 0.0
+            best_indices = similarity.argmax(axis=1)
+            best_similarities = similarity[np.arange(len(objects1)), best_indices]
+        
+        # Triangulate all matched pairs together
+        matched = best_similarities > 0.3  # Threshold for matching
+        if matched.any():
+            triangulated = np.full((len(objects1), 3), np.nan)
+            triangulated[matched] = self._triangulate_positions(centers1[matched], centers2[best_indices[matched]])
+        
         # Calculate 3D positions for objects from camera 1
-        for obj1 in objects1:
-            # For each object in camera 1, try to find a corresponding object in camera 2
-            # If found, use triangulation; if not, estimate position using single camera
-            best_match = None
-            best_similarity = 0
-            
-            for obj2 in objects2:
-                # Calculate similarity based on class and position
-                if obj1.class_name == obj2.class_name:
-                    # Simple similarity based on vertical position (assuming cameras are at same height)
-                    center1 = obj1.get_center()
-                    center2 = obj2.get_center()
-                    y_diff = abs(center1[1] - center2[1])
-                    similarity = 1.0 / (1.0 + y_diff / FRAME_HEIGHT)  # Normalize by frame height
-                    
-                    if similarity > best_similarity and similarity > 0.3:  # Threshold for matching
-                        best_similarity = similarity
-                        best_match = obj2
-            
-            # Calculate 3D position
-            if best_match is not None:
-                # Use triangulation with matched object
-                pos_3d = self._triangulate_position(obj1, best_match)
+        for index, (obj1, is_matched) in enumerate(zip(objects1, matched)):
+            # If a match was found, use triangulation; if not, estimate position using single camera
+            if is_matched:
+                # NaN marks pairs whose disparity is too small to triangulate
+                position = triangulated[index]
+                pos_3d = None if np.isnan(position[2]) else (float(position[0]), float(position[1]), float(position[2]))
             else:
                 # Estimate position using single camera (assume object is at typical depth)
                 pos_3d = self._estimate_single_camera_position(obj1, "camera1")
@@ -374,49 +540,38 @@ class ObjectTracker:
                 if pos_3d is not None:
                     obj2.position_3d = pos_3d
     
-    def _triangulate_position(self, obj1: DetectedObject, obj2: DetectedObject) -> Optional[Tuple[float, float, float]]:
+    def _triangulate_positions(self, centers1: np.ndarray, centers2: np.ndarray) -> np.ndarray:
         """
-        Calculate 3D position using triangulation.
+        Calculate 3D positions of matched object pairs using triangulation.
         
         Args:
-            obj1: Object from camera 1
-            obj2: Object from camera 2
+            centers1: (N, 2) pixel centers of the objects in camera 1
+            centers2: (N, 2) pixel centers of their matches in camera 2
             
         Returns:
-            3D position (x, y, z) or None if calculation fails
+            (N, 3) array of 3D positions (x, y, z), with NaN rows where the disparity is too small
         """
-        try:
-            # Get centers of objects
-            center1 = obj1.get_center()
-            center2 = obj2.get_center()
-            
-            # Convert pixel coordinates to normalized coordinates
-            x1 = (center1[0] - FRAME_WIDTH // 2) / (FRAME_WIDTH // 2)
-            y1 = (center1[1] - FRAME_HEIGHT // 2) / (FRAME_HEIGHT // 2)
-            x2 = (center2[0] - FRAME_WIDTH // 2) / (FRAME_WIDTH // 2)
-            y2 = (center2[1] - FRAME_HEIGHT // 2) / (FRAME_HEIGHT // 2)
-            
-            # Simple triangulation (assumes cameras are parallel and at same height)
-            # This is a simplified calculation - real applications need proper calibration
-            
-            # Calculate depth using disparity
-            disparity = abs(x1 - x2)
-            if disparity < 0.01:  # Avoid division by zero
-                return None
-            
-            # Simplified depth calculation
-            depth = CAMERA_DISTANCE / disparity
-            
-            # Calculate 3D position
-            x_3d = (x1 + x2) * depth / 2
-            y_3d = (y1 + y2) * depth / 2
-            z_3d = depth
-            
-            return (x_3d, y_3d, z_3d)
-            
-        except Exception as e:
-            logger.error(f"Error in triangulation: {e}")
-            return None
+        # Convert pixel coordinates to normalized coordinates
+        half_size = np.array([FRAME_WIDTH // 2, FRAME_HEIGHT // 2], dtype=np.float64)
+        norm1 = (centers1 - half_size) / half_size
+        norm2 = (centers2 - half_size) / half_size
+        
+        # Simple triangulation (assumes cameras are parallel and at same height)
+        # This is a simplified calculation - real applications need proper calibration
+        
+        # Calculate depth using disparity
+        disparity = np.abs(norm1[:, 0] - norm2[:, 0])
+        valid = disparity >= 0.01  # Avoid division by zero
+        
+        # Simplified depth calculation
+        depth = np.full(len(disparity), np.nan)
+        depth[valid] = CAMERA_DISTANCE / disparity[valid]
+        
+        # Calculate 3D position
+        positions = np.empty((len(disparity), 3))
+        positions[:, :2] = (norm1 + norm2) * depth[:, None] / 2
+        positions[:, 2] = depth
+        return positions
     
     def _estimate_single_camera_position(self, obj: DetectedObject, camera_id: str) -> Optional[Tuple[float, float, float]]:
         """
@@ -487,18 +642,24 @@ class ObjectTracker:
             "camera2": camera2_objects
         }
     
-    def draw_detections(self, frame: np.ndarray, objects: List[DetectedObject]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, objects: List[DetectedObject],
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Draw detection boxes and tracking information on frame.
         
         Args:
             frame: Input frame
             objects: List of detected objects
+            out: Optional preallocated buffer with frame's shape to draw into instead of a new copy
             
         Returns:
             Frame with drawings
         """
-        result = frame.copy()
+        if out is None:
+            result = frame.copy()
+        else:
+            result = out
+            np.copyto(result, frame)
         
         for obj in objects:
             x, y, w, h = obj.bbox
@@ -0,0 +1,49 @@
+"""
+Test script for choosing the JPEG decode-time downscale
+"""
+
+from fractions import Fraction
+import camera_manager
+from camera_manager import _JPEG_SCALES, _IMREAD_REDUCED, _pick_jpeg_scale
+from config import FRAME_WIDTH, FRAME_HEIGHT
+
+# Scaling factors libjpeg-turbo supports: n/8 for n = 1..16
+TURBOJPEG_FACTORS = {Fraction(n, 8) for n in range(1, 17)}
+
+def test_scales_are_turbojpeg_factors():
+    """Every candidate scale must be one TurboJPEG can decode with."""
+    for num, den in _JPEG_SCALES:
+        assert Fraction(num, den) in TURBOJPEG_FACTORS, f"{num}/{den} is not an n/8 factor"
+    print("✅ All decode scales are n/8 factors")
+
+def test_pick_jpeg_scale():
+    """Check the chosen scale is the smallest one that still covers the frame size."""
+    sizes = [(FRAME_WIDTH, FRAME_HEIGHT), (1280, 720), (1920, 1080), (3840, 2160), (4000, 3000)]
+    saved_tj = camera_manager._TJ
+    try:
+        for tj in (object(), None):  # With and without libjpeg-turbo
+            camera_manager._TJ = tj
+            allowed = [s for s in _JPEG_SCALES if tj is not None or s in _IMREAD_REDUCED]
+            for width, height in sizes:
+                num, den = _pick_jpeg_scale(width, height)
+                assert (num, den) in allowed
+                assert Fraction(num, den) in TURBOJPEG_FACTORS
+                
+                # The decoded frame must not be smaller than the output frame
+                if (num, den) != (1, 1):
+                    assert -(-width * num // den) >= FRAME_WIDTH
+                    assert -(-height * num // den) >= FRAME_HEIGHT
+                
+                # No smaller allowed scale would have been big enough
+                for s_num, s_den in allowed:
+                    if Fraction(s_num, s_den) < Fraction(num, den):
+                        assert (-(-width * s_num // s_den) < FRAME_WIDTH or
+                                -(-height * s_num // s_den) < FRAME_HEIGHT)
+                print(f"  {width}x{height} -> {num}/{den} (turbojpeg={tj is not None})")
+    finally:
+        camera_manager._TJ = saved_tj
+    print("✅ Decode scale selection is correct")
+
+if __name__ == "__main__":
+    test_scales_are_turbojpeg_factors()
+    test_pick_jpeg_scale()
@@ -0,0 +1,28 @@
+"""
+Test script for the configuration UI preview image conversion
+"""
+
+import numpy as np
+from camera_config_ui import PREVIEW_SIZE, _preview_image
+
+def test_preview_image_tracks_buffer():
+    """Check that each preview image shows the pixels currently in the RGB buffer."""
+    width, height = PREVIEW_SIZE
+    rgb = np.empty((height, width, 3), np.uint8)
+    
+    # Paint the reused buffer twice; every image must reflect the latest paint
+    for color in [(255, 0, 0), (10, 200, 30)]:
+        rgb[:] = color
+        rgb[0, 0] = (1, 2, 3)
+        image = _preview_image(rgb)
+        
+        assert image.mode == 'RGB'
+        assert image.size == PREVIEW_SIZE
+        assert image.getpixel((0, 0)) == (1, 2, 3)
+        assert image.getpixel((width - 1, height - 1)) == color
+        assert image.getpixel((width // 2, height // 2)) == color
+    
+    print("✅ Preview image follows the RGB buffer")
+
+if __name__ == "__main__":
+    test_preview_image_tracks_buffer()